@@ -12,9 +12,24 @@ class Settings(BaseSettings):
     LATITUDE: float = 40.7128
     LONGITUDE: float = -74.0060
     TIMEZONE: str = "America/New_York"
+    STATION: str = "KNYC"
     
     # API Settings
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
+    
+    # Background refresh scheduler (intervals in seconds)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_WORKERS: int = 2
+    WEATHER_REFRESH_SECONDS: int = 6 * 60 * 60
+    HOURLY_REFRESH_SECONDS: int = 6 * 60 * 60
+    FUTURES_REFRESH_SECONDS: int = 24 * 60 * 60
+    FORECAST_REFRESH_SECONDS: int = 6 * 60 * 60
+    FEATURES_REBUILD_SECONDS: int = 24 * 60 * 60
+    MODEL_RETRAIN_SECONDS: int = 7 * 24 * 60 * 60
+    
+    # Range cache: how often each cache polls ingestion_log, and how long rows are kept there
+    CACHE_POLL_SECONDS: float = 1.0
+    INGESTION_LOG_RETENTION_SECONDS: int = 24 * 60 * 60
 
 settings = Settings() 
\ No newline at end of file
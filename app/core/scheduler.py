@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """A periodic job run by the Scheduler."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        interval_seconds: float,
+        max_concurrency: int = 1,
+        cpu_bound: bool = False,
+        on_result: Optional[Callable[[Any], None]] = None,
+        exclusion_group: Optional[str] = None,
+        run_on_start: bool = False
+    ):
+        """
+        func runs in a worker thread, or in the process pool when cpu_bound is
+        set (it must then be picklable). on_result runs in the app process with
+        the return value, e.g. to invalidate in-process caches. Jobs sharing an
+        exclusion_group never run at the same time; a run waits for the group.
+        run_on_start runs the job as soon as the scheduler starts instead of
+        after the first interval.
+        """
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.max_concurrency = max_concurrency
+        self.cpu_bound = cpu_bound
+        self.on_result = on_result
+        self.exclusion_group = exclusion_group
+        self.run_on_start = run_on_start
+
+        self.running = 0
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_status: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_started: Optional[datetime] = None
+        self.last_finished: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.next_run: Optional[datetime] = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'interval_seconds': self.interval_seconds,
+            'max_concurrency': self.max_concurrency,
+            'cpu_bound': self.cpu_bound,
+            'exclusion_group': self.exclusion_group,
+            'run_on_start': self.run_on_start,
+            'running': self.running,
+            'runs': self.runs,
+            'failures': self.failures,
+            'skipped': self.skipped,
+            'last_status': self.last_status,
+            'last_error': self.last_error,
+            'last_started': self.last_started,
+            'last_finished': self.last_finished,
+            'last_duration_seconds': self.last_duration,
+            'next_run': self.next_run,
+        }
+
+class Scheduler:
+    """
+    Runs registered jobs on fixed intervals inside the running event loop.
+    A job tick is skipped while the job already has max_concurrency runs in
+    flight, so slow refreshes never pile up.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self.jobs: Dict[str, Job] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._loops: List[asyncio.Task] = []
+        self._runs: set = set()
+        self._ticks: set = set()
+        self._stopping = False
+        self._group_locks: Dict[str, asyncio.Lock] = {}
+
+    def add_job(self, job: Job) -> Job:
+        if job.name in self.jobs:
+            raise ValueError(f"Job already registered: {job.name}")
+        self.jobs[job.name] = job
+        return job
+
+    def start(self) -> None:
+        """Start one timer task per job. Must be called from the event loop."""
+        if self._loops:
+            return
+        self._stopping = False
+        self._loops = [asyncio.create_task(self._run_forever(job)) for job in self.jobs.values()]
+        logger.info(f"Scheduler started with {len(self._loops)} jobs")
+
+    async def stop(self) -> None:
+        """Cancel the timers, wait for in-flight runs and shut down the pool."""
+        self._stopping = True
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        # Ticks fired just before the cancel skip their run once they see _stopping
+        await asyncio.gather(*self._ticks, return_exceptions=True)
+        await asyncio.gather(*self._runs, return_exceptions=True)
+        self._loops = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [job.status() for job in self.jobs.values()]
+
+    async def run_job(self, name: str) -> bool:
+        """
+        Run a job now and wait for it. Returns False if the run was skipped
+        because the job is at its concurrency limit.
+        """
+        job = self.jobs[name]
+        if self._stopping:
+            logger.info(f"Skipping {job.name}: scheduler is stopping")
+            return False
+        if job.running >= job.max_concurrency:
+            job.skipped += 1
+            logger.info(f"Skipping {job.name}: {job.running} run(s) still in progress")
+            return False
+
+        job.running += 1
+        task = asyncio.ensure_future(self._execute(job))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+        await task
+        return True
+
+    async def _run_forever(self, job: Job) -> None:
+        if job.run_on_start:
+            self._tick(job)
+        while True:
+            job.next_run = datetime.fromtimestamp(time.time() + job.interval_seconds, timezone.utc)
+            await asyncio.sleep(job.interval_seconds)
+            self._tick(job)
+
+    def _tick(self, job: Job) -> None:
+        # Fire and forget so the timer keeps its cadence while the job runs; stop() waits on these
+        task = asyncio.ensure_future(self.run_job(job.name))
+        self._ticks.add(task)
+        task.add_done_callback(self._ticks.discard)
+
+    async def _execute(self, job: Job) -> None:
+        if job.exclusion_group is None:
+            await self._call(job)
+            return
+        lock = self._group_locks.setdefault(job.exclusion_group, asyncio.Lock())
+        async with lock:
+            await self._call(job)
+
+    async def _call(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        job.last_started = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            if job.cpu_bound:
+                if self._pool is None:
+                    # Spawn rather than fork so workers don't inherit the app's pooled DB connections
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                result = await loop.run_in_executor(self._pool, job.func)
+            else:
+                result = await loop.run_in_executor(None, job.func)
+            if job.on_result is not None:
+                job.on_result(result)
+            job.last_status = 'success'
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_status = 'error'
+            job.last_error = str(e)
+            logger.error(f"Job {job.name} failed: {str(e)}", exc_info=True)
+        finally:
+            job.running -= 1
+            job.runs += 1
+            job.last_duration = time.perf_counter() - started
+            job.last_finished = datetime.now(timezone.utc)
@@ -0,0 +1,346 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from threading import RLock
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, select
+
+from app.core.config import settings
+from app.db.database import Bind, begin, connect
+from app.db.models import WeatherData, FuturesData, DailyFeature, IngestionLog
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+# Dataset name -> (model, columns served). Futures are keyed by symbol, the rest are not.
+DATASETS = {
+    'weather': (WeatherData, [
+        'date', 'high_temp', 'low_temp', 'avg_temp', 'cdd', 'hdd',
+        'cdh', 'hdh', 'hourly_low', 'hourly_high', 'hourly_mean'
+    ]),
+    'futures': (FuturesData, ['timestamp', 'instrument_id', 'symbol', 'open', 'high', 'low', 'close', 'volume']),
+    'features': (DailyFeature, [
+        column.name for column in DailyFeature.__table__.columns if column.name != 'id'
+    ]),
+}
+
+@dataclass
+class _Block:
+    """A contiguous, fully loaded date range stored column-wise, sorted by date."""
+    start: np.datetime64
+    end: np.datetime64
+    columns: Dict[str, np.ndarray]
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns['date'])
+
+    def slice(self, start: np.datetime64, end: np.datetime64) -> Dict[str, np.ndarray]:
+        dates = self.columns['date']
+        lo = np.searchsorted(dates, start, side='left')
+        hi = np.searchsorted(dates, end, side='right')
+        return {name: values[lo:hi] for name, values in self.columns.items()}
+
+def _to_day(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+def _read_only(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    for values in columns.values():
+        values.flags.writeable = False
+    return columns
+
+def _concat(parts: list) -> Dict[str, np.ndarray]:
+    """Concatenate date-ordered, non-overlapping column blocks."""
+    # Empty loads carry object dtype, so leave them out unless nothing else is there
+    non_empty = [part for part in parts if len(part['date'])] or parts[:1]
+    if len(non_empty) == 1:
+        return non_empty[0]
+    return _read_only({
+        name: np.concatenate([part[name] for part in non_empty]) for name in non_empty[0]
+    })
+
+class RangeCache:
+    """
+    In-process cache of (dataset, symbol, date range) slices.
+
+    Each (dataset, symbol) key holds non-overlapping blocks of loaded dates;
+    a request only queries the database for the days no block covers, then
+    merges everything into a single block. Blocks are evicted least recently
+    used once the total row count exceeds max_rows.
+
+    Ingestion code calls record_ingestion() after committing. That drops the
+    affected days here and appends them to ingestion_log, which get() polls
+    at most once every poll_seconds, so writes made by other processes (the
+    ingestion scripts, scheduler workers) invalidate this cache too, and
+    hits in between never touch the database.
+    """
+
+    def __init__(
+        self,
+        bind: Optional[Bind] = None,
+        max_rows: int = 1_000_000,
+        poll_seconds: Optional[float] = None
+    ):
+        self.bind = bind
+        self.max_rows = max_rows
+        self.poll_seconds = settings.CACHE_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self.hits = 0
+        self.loads = 0
+        self._blocks: "OrderedDict[tuple, _Block]" = OrderedDict()
+        self._lock = RLock()
+        # Last ingestion_log id applied, and a counter bumped by every invalidation
+        self._log_id: Optional[int] = None
+        self._last_poll = float('-inf')
+        self._generation = 0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(block.rows for block in self._blocks.values())
+
+    def get(
+        self,
+        dataset: str,
+        start: date,
+        end: date,
+        symbol: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """Return the columns for [start, end] as read-only numpy arrays."""
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        start, end = _to_day(start), _to_day(end)
+        if end < start:
+            raise ValueError("end must not be before start")
+        if dataset != 'futures':
+            symbol = None
+        key = (dataset, symbol)
+        self._sync()
+
+        while True:
+            with self._lock:
+                # Fast path: one block already covers the whole range
+                for block_id, block in self._blocks_for(key):
+                    if block.start <= start and end <= block.end:
+                        self._blocks.move_to_end(block_id)
+                        self.hits += 1
+                        return block.slice(start, end)
+
+                gaps = []
+                cursor = start
+                for _, block in self._touching(key, start, end):
+                    if cursor < block.start:
+                        gaps.append((cursor, block.start - ONE_DAY))
+                    cursor = max(cursor, block.end + ONE_DAY)
+                if cursor <= end:
+                    gaps.append((cursor, end))
+                generation = self._generation
+
+            # Query without the lock so hits on other ranges aren't held up
+            loaded = [
+                _Block(gap_start, gap_end, self._load(dataset, symbol, gap_start, gap_end))
+                for gap_start, gap_end in gaps
+            ]
+
+            with self._lock:
+                # Another thread may have invalidated or evicted blocks meanwhile; load again
+                if self._generation != generation:
+                    continue
+                merged = self._merge(key, start, end, loaded)
+                if merged is None:
+                    continue
+                self._evict()
+                return merged.slice(start, end)
+
+    def get_frame(
+        self,
+        dataset: str,
+        start: date,
+        end: date,
+        symbol: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Same as get() but returns a DataFrame."""
+        return pd.DataFrame(self.get(dataset, start, end, symbol))
+
+    def invalidate(
+        self,
+        dataset: str,
+        dates: Iterable[date],
+        symbol: Optional[str] = None
+    ) -> None:
+        """
+        Drop cached days for dataset. Blocks are split around the given dates
+        so the rest of their range stays cached. symbol=None hits every symbol.
+        """
+        days = np.unique(np.array([_to_day(day) for day in dates], dtype='datetime64[D]'))
+        if not len(days):
+            return
+
+        with self._lock:
+            self._generation += 1
+            for block_id, block in list(self._blocks.items()):
+                (block_dataset, block_symbol), _ = block_id
+                if block_dataset != dataset or (symbol is not None and block_symbol != symbol):
+                    continue
+
+                stale = days[(days >= block.start) & (days <= block.end)]
+                if not len(stale):
+                    continue
+
+                del self._blocks[block_id]
+                bounds = [block.start - ONE_DAY, *stale, block.end + ONE_DAY]
+                for prev_day, next_day in zip(bounds[:-1], bounds[1:]):
+                    if next_day - prev_day > ONE_DAY:
+                        piece = _Block(
+                            prev_day + ONE_DAY,
+                            next_day - ONE_DAY,
+                            block.slice(prev_day + ONE_DAY, next_day - ONE_DAY)
+                        )
+                        self._blocks[(block_id[0], piece.start)] = piece
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._blocks.clear()
+
+    def _blocks_for(self, key: tuple) -> list:
+        return [(block_id, block) for block_id, block in self._blocks.items() if block_id[0] == key]
+
+    def _touching(self, key: tuple, start: np.datetime64, end: np.datetime64) -> list:
+        """Blocks overlapping or adjacent to [start, end], ordered by start."""
+        touching = [
+            (block_id, block) for block_id, block in self._blocks_for(key)
+            if block.start <= end + ONE_DAY and start <= block.end + ONE_DAY
+        ]
+        return sorted(touching, key=lambda item: item[1].start)
+
+    def _merge(
+        self,
+        key: tuple,
+        start: np.datetime64,
+        end: np.datetime64,
+        loaded: list
+    ) -> Optional[_Block]:
+        """
+        Merge the freshly loaded blocks with the cached blocks touching
+        [start, end] into one block. Returns None, leaving the cache as it
+        was, if the blocks no longer cover the range without a hole.
+        """
+        touching = self._touching(key, start, end)
+        segments = sorted([block for _, block in touching] + loaded, key=lambda block: block.start)
+
+        parts = []
+        cursor = segments[0].start
+        for block in segments:
+            if block.end < cursor:
+                continue
+            if block.start > cursor:
+                return None
+            parts.append(block.slice(cursor, block.end))
+            cursor = block.end + ONE_DAY
+        merged = _Block(segments[0].start, cursor - ONE_DAY, _concat(parts))
+        if not (merged.start <= start and end <= merged.end):
+            return None
+
+        for block_id, _ in touching:
+            del self._blocks[block_id]
+        self._blocks[(key, merged.start)] = merged
+        return merged
+
+    def _sync(self) -> None:
+        """
+        Apply ingestion_log entries written by any process since the last
+        poll. Does nothing if the last poll was under poll_seconds ago.
+        """
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_seconds:
+            return
+        # Entries written since a poll older than the retention may already be pruned
+        expired = now - self._last_poll > settings.INGESTION_LOG_RETENTION_SECONDS
+        self._last_poll = now
+
+        if self._log_id is None or expired:
+            if self._log_id is not None:
+                self.clear()
+            with connect(self.bind) as conn:
+                self._log_id = conn.execute(select(func.max(IngestionLog.id))).scalar() or 0
+            return
+
+        with connect(self.bind) as conn:
+            entries = conn.execute(
+                select(IngestionLog.id, IngestionLog.dataset, IngestionLog.start_date, IngestionLog.end_date)
+                .where(IngestionLog.id > self._log_id)
+                .order_by(IngestionLog.id)
+            ).fetchall()
+        for entry in entries:
+            if entry.dataset in DATASETS:
+                self.invalidate(entry.dataset, pd.date_range(entry.start_date, entry.end_date))
+        if entries:
+            with self._lock:
+                self._log_id = max(self._log_id, entries[-1].id)
+
+    def _evict(self) -> None:
+        total = self.total_rows
+        while total > self.max_rows and len(self._blocks) > 1:
+            _, block = self._blocks.popitem(last=False)
+            total -= block.rows
+
+    def _load(
+        self,
+        dataset: str,
+        symbol: Optional[str],
+        start: np.datetime64,
+        end: np.datetime64
+    ) -> Dict[str, np.ndarray]:
+        """Query [start, end] for one dataset and return it column-wise."""
+        model, columns = DATASETS[dataset]
+        start_day, end_day = start.item(), end.item()
+
+        query = select(*[getattr(model, column) for column in columns])
+        if dataset == 'futures':
+            query = (
+                query
+                .where(FuturesData.timestamp >= datetime.combine(start_day, datetime.min.time()))
+                .where(FuturesData.timestamp < datetime.combine(end_day + timedelta(days=1), datetime.min.time()))
+                .order_by(FuturesData.timestamp)
+            )
+            if symbol is not None:
+                query = query.where(FuturesData.symbol == symbol)
+        else:
+            query = query.where(model.date.between(start_day, end_day)).order_by(model.date)
+
+        with connect(self.bind) as conn:
+            df = pd.DataFrame(conn.execute(query).fetchall(), columns=columns)
+        self.loads += 1
+
+        if dataset == 'futures':
+            df['date'] = pd.to_datetime(df['timestamp'], utc=True).dt.tz_localize(None).dt.normalize()
+
+        block = {column: df[column].to_numpy() for column in df.columns}
+        block['date'] = df['date'].to_numpy().astype('datetime64[D]')
+        return _read_only(block)
+
+range_cache = RangeCache()
+
+def record_ingestion(dataset: str, dates: Iterable[date], bind: Optional[Bind] = None) -> None:
+    """
+    Announce committed writes to dataset on dates: drop them from this
+    process's range_cache and log them, one row per run of consecutive days,
+    so caches in other processes follow. Rows older than the retention
+    period are pruned on the way.
+    """
+    days = np.unique(np.array([_to_day(day) for day in dates], dtype='datetime64[D]'))
+    if not len(days):
+        return
+    range_cache.invalidate(dataset, days)
+
+    breaks = np.flatnonzero(np.diff(days) > ONE_DAY) + 1
+    runs = [
+        {'dataset': dataset, 'start_date': run[0].item(), 'end_date': run[-1].item()}
+        for run in np.split(days, breaks)
+    ]
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.INGESTION_LOG_RETENTION_SECONDS)
+    with begin(bind) as conn:
+        conn.execute(insert(IngestionLog), runs)
+        conn.execute(delete(IngestionLog).where(IngestionLog.created_at < cutoff))
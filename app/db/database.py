@@ -1,13 +1,48 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ETL functions accept either an Engine or a Connection. Passing a Connection
+# that is already inside a transaction (as the tests do) turns every commit
+# into a SAVEPOINT release, so the caller can roll all of it back.
+Bind = Union[Engine, Connection]
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def get_session(bind: Optional[Bind] = None) -> Session:
+    """Session on bind, defaulting to the application engine."""
+    if bind is None:
+        return SessionLocal()
+    return SessionLocal(bind=bind, join_transaction_mode="create_savepoint")
+
+@contextmanager
+def connect(bind: Optional[Bind] = None) -> Iterator[Connection]:
+    """Connection for reads on bind, defaulting to the application engine."""
+    bind = bind if bind is not None else engine
+    if isinstance(bind, Connection):
+        yield bind
+    else:
+        with bind.connect() as conn:
+            yield conn
+
+@contextmanager
+def begin(bind: Optional[Bind] = None) -> Iterator[Connection]:
+    """Connection inside a transaction that commits on exit, or a SAVEPOINT on a Connection."""
+    bind = bind if bind is not None else engine
+    if isinstance(bind, Connection):
+        with bind.begin_nested():
+            yield bind
+    else:
+        with bind.begin() as conn:
+            yield conn
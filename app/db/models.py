@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, Date, Float, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Date, Float, String, Integer, DateTime, ForeignKey, REAL, UniqueConstraint, func
 
 class Base(DeclarativeBase):
     pass
@@ -14,6 +14,12 @@ class WeatherData(Base):
     avg_temp = Column(Float, nullable=False)
     cdd = Column(Float, nullable=False)
     hdd = Column(Float, nullable=False)
+    # Degree-hours and aggregates from hourly temperatures (null until hourly data is loaded)
+    cdh = Column(Float, nullable=True)
+    hdh = Column(Float, nullable=True)
+    hourly_low = Column(Float, nullable=True)
+    hourly_high = Column(Float, nullable=True)
+    hourly_mean = Column(Float, nullable=True)
 
 class SettlementPrice(Base):
     __tablename__ = "settlement_prices"
@@ -34,4 +40,72 @@ class FuturesData(Base):
     high = Column(Float, nullable=False)
     low = Column(Float, nullable=False)
     close = Column(Float, nullable=False)
-    volume = Column(Integer, nullable=False) 
\ No newline at end of file
+    volume = Column(Integer, nullable=False) 
+
+class DailyFeature(Base):
+    __tablename__ = "daily_features"
+    
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, unique=True, nullable=False, index=True)
+    
+    # Weather metrics
+    high_temp = Column(Float, nullable=False)
+    low_temp = Column(Float, nullable=False)
+    avg_temp = Column(Float, nullable=False)
+    cdd = Column(Float, nullable=False)
+    hdd = Column(Float, nullable=False)
+    cdh = Column(Float, nullable=True)
+    hdh = Column(Float, nullable=True)
+    
+    # Front-month futures (null on days without a settlement)
+    symbol = Column(String, nullable=True)
+    price = Column(Float, nullable=True)
+    price_return = Column(Float, nullable=True)
+    
+    # Lagged degree days
+    cdd_lag_1 = Column(Float, nullable=True)
+    hdd_lag_1 = Column(Float, nullable=True)
+    cdd_lag_7 = Column(Float, nullable=True)
+    hdd_lag_7 = Column(Float, nullable=True)
+    
+    # Calendar features
+    day_of_week = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    day_of_year = Column(Integer, nullable=False)
+
+
+class WeatherForecast(Base):
+    __tablename__ = "weather_forecasts"
+    __table_args__ = (
+        UniqueConstraint("issue_time", "valid_date", "station", name="uq_forecast_vintage"),
+    )
+    
+    # One row per forecast vintage; degree days are derived at scoring time
+    id = Column(Integer, primary_key=True)
+    issue_time = Column(DateTime(timezone=True), nullable=False, index=True)
+    valid_date = Column(Date, nullable=False, index=True)
+    station = Column(String(16), nullable=False)
+    high_temp = Column(REAL, nullable=False)
+    low_temp = Column(REAL, nullable=False)
+    avg_temp = Column(REAL, nullable=False)
+
+
+class HourlyTemperature(Base):
+    __tablename__ = "weather_hourly"
+    __table_args__ = {"postgresql_partition_by": "RANGE (timestamp)"}
+    
+    # Partitioned by year on PostgreSQL; see scripts/fetch_hourly_weather.py
+    station = Column(String(16), primary_key=True)
+    timestamp = Column(DateTime(timezone=True), primary_key=True)
+    temperature = Column(REAL, nullable=False)
+
+
+class IngestionLog(Base):
+    __tablename__ = "ingestion_log"
+    
+    # One row per committed write; processes holding a RangeCache poll it for new ids
+    id = Column(Integer, primary_key=True)
+    dataset = Column(String(32), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
@@ -0,0 +1,58 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from app.core.config import settings
+from app.core.scheduler import Scheduler, Job
+from app.db.cache import range_cache
+from scripts.fetch_weather import update_weather_data
+from scripts.fetch_hourly_weather import update_hourly_weather
+from scripts.process_data import update_futures_data
+from scripts.fetch_forecast import update_weather_forecast
+from scripts.build_features import rebuild_daily_features
+from scripts.train_model import retrain_price_model
+
+# Jobs that rewrite daily_features run one at a time
+FEATURES_GROUP = 'daily_features'
+
+scheduler = Scheduler(max_workers=settings.SCHEDULER_WORKERS)
+# Every job also runs at startup, so restarts more frequent than an interval never starve it
+scheduler.add_job(Job(
+    'weather', update_weather_data, settings.WEATHER_REFRESH_SECONDS,
+    exclusion_group=FEATURES_GROUP, run_on_start=True
+))
+# Registered after weather so, sharing its interval, it runs once the new days exist
+scheduler.add_job(Job(
+    'hourly', update_hourly_weather, settings.HOURLY_REFRESH_SECONDS,
+    exclusion_group=FEATURES_GROUP, run_on_start=True
+))
+scheduler.add_job(Job(
+    'futures', update_futures_data, settings.FUTURES_REFRESH_SECONDS,
+    exclusion_group=FEATURES_GROUP, run_on_start=True
+))
+scheduler.add_job(Job('forecast', update_weather_forecast, settings.FORECAST_REFRESH_SECONDS, run_on_start=True))
+scheduler.add_job(Job(
+    'features',
+    rebuild_daily_features,
+    settings.FEATURES_REBUILD_SECONDS,
+    cpu_bound=True,
+    # The rebuild logs its writes from the worker; drop our cached rows now rather than at the next poll
+    on_result=lambda dates: range_cache.invalidate('features', dates),
+    exclusion_group=FEATURES_GROUP,
+    run_on_start=True
+))
+scheduler.add_job(Job(
+    'model', retrain_price_model, settings.MODEL_RETRAIN_SECONDS, cpu_bound=True, run_on_start=True
+))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+
+app = FastAPI(title="Historical Weather", lifespan=lifespan)
+
+@app.get("/jobs")
+def list_jobs():
+    """Status, run counts and last durations of the background refresh jobs."""
+    return scheduler.status()
@@ -1,56 +1,43 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sqlalchemy import select, func
 from pathlib import Path
 import sys
 import logging
 from datetime import datetime
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
 
 # Add the parent directory to sys.path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from app.db.models import WeatherData, FuturesData
-from app.db.database import engine
+from scripts.build_features import load_daily_features
+from scripts.resampling import (
+    bootstrap_ci,
+    permutation_test,
+    row_corr,
+    row_mean_where,
+    row_std_where,
+    row_mean_difference,
+)
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Resampling settings for confidence intervals and permutation tests
+N_RESAMPLES = 10_000
+BLOCK_SIZE = 20  # ~one trading month, to respect autocorrelation in prices
+SEED = 42
+
 def fetch_combined_data() -> pd.DataFrame:
-    """Fetch and combine weather and futures data."""
+    """Fetch combined weather and front-month price data from the daily feature table."""
     try:
-        # Create the query using SQLAlchemy ORM
-        query = (
-            select(
-                WeatherData.date,
-                WeatherData.high_temp,
-                WeatherData.low_temp,
-                WeatherData.avg_temp,
-                WeatherData.cdd,
-                WeatherData.hdd,
-                FuturesData.close.label('price'),
-                FuturesData.symbol
-            )
-            .join(
-                FuturesData,
-                func.date(FuturesData.timestamp) == WeatherData.date
-            )
-            .where(
-                # Filter for front-month contracts
-                FuturesData.symbol.regexp_match('^HH[A-Z]\d$')
-            )
-            .where(
-                # Exclude spread products
-                ~FuturesData.symbol.like('%-%')
-            )
-            .order_by(WeatherData.date)
-        )
-
-        # Execute query and convert to DataFrame
-        with engine.connect() as conn:
-            result = conn.execute(query)
-            df = pd.DataFrame(result.fetchall(), columns=result.keys())
+        df = load_daily_features()
+        
+        # Keep only days with a front-month settlement
+        df = df.loc[df['price'].notna()].reset_index(drop=True)
             
         logger.info(f"Fetched {len(df)} combined records")
         
@@ -60,7 +47,7 @@ def fetch_combined_data() -> pd.DataFrame:
         logger.error(f"Error fetching data: {str(e)}")
         raise
 
-def analyze_correlations(df: pd.DataFrame) -> None:
+def analyze_correlations(df: pd.DataFrame, executor: Optional[Executor] = None) -> None:
     """Analyze and visualize correlations between weather metrics and prices."""
     
     # Calculate correlations
@@ -75,11 +62,19 @@ def analyze_correlations(df: pd.DataFrame) -> None:
     plt.savefig('data/correlation_heatmap.png')
     plt.close()
     
-    # Log correlation with price
+    # Log correlation with price, with block-bootstrap CI and permutation p-value
     logger.info("\nCorrelations with Natural Gas Prices:")
     for col in corr_columns[1:]:
-        corr = corr_matrix.loc['price', col]
-        logger.info(f"{col}: {corr:.3f}")
+        pairs = df[['price', col]].dropna()
+        arrays = [pairs['price'].to_numpy(), pairs[col].to_numpy()]
+        ci = bootstrap_ci(row_corr, arrays, N_RESAMPLES, BLOCK_SIZE, seed=SEED, executor=executor)
+        test = permutation_test(
+            row_corr, arrays, permute=1, n_resamples=N_RESAMPLES, block_size=BLOCK_SIZE, seed=SEED, executor=executor
+        )
+        logger.info(
+            f"{col}: {corr_matrix.loc['price', col]:.3f} "
+            f"(95% CI {ci['low']:.3f} to {ci['high']:.3f}, p={test['p_value']:.4f})"
+        )
 
 def analyze_seasonal_patterns(df: pd.DataFrame) -> None:
     """Analyze seasonal patterns in prices relative to CDD and HDD."""
@@ -120,7 +115,7 @@ def analyze_seasonal_patterns(df: pd.DataFrame) -> None:
     plt.savefig('data/seasonal_patterns.png')
     plt.close()
 
-def analyze_extreme_weather_impact(df: pd.DataFrame) -> None:
+def analyze_extreme_weather_impact(df: pd.DataFrame, executor: Optional[Executor] = None) -> None:
     """Analyze price behavior during extreme weather events."""
     
     # Define extreme weather thresholds
@@ -147,6 +142,32 @@ def analyze_extreme_weather_impact(df: pd.DataFrame) -> None:
     logger.info(f"Normal Volatility: {normal_vol:.3f}")
     logger.info(f"Volatility during high CDD: {high_cdd_vol:.3f}")
     logger.info(f"Volatility during high HDD: {high_hdd_vol:.3f}")
+    
+    # Uncertainty of the extreme-weather statistics
+    price = df['price'].to_numpy()
+    price_change = df['price_change'].to_numpy()
+    has_change = ~np.isnan(price_change)
+    price_change = np.nan_to_num(price_change)
+    
+    logger.info(f"\nBlock bootstrap 95% CIs ({N_RESAMPLES:,} resamples, block size {BLOCK_SIZE}):")
+    for label, extreme in [
+        ('high CDD', (df['cdd'] > high_cdd_threshold).to_numpy()),
+        ('high HDD', (df['hdd'] > high_hdd_threshold).to_numpy())
+    ]:
+        mean_ci = bootstrap_ci(row_mean_where, [price, extreme], N_RESAMPLES, BLOCK_SIZE, seed=SEED, executor=executor)
+        vol_ci = bootstrap_ci(
+            row_std_where, [price_change, extreme & has_change], N_RESAMPLES, BLOCK_SIZE, seed=SEED, executor=executor
+        )
+        premium = permutation_test(
+            row_mean_difference, [price, extreme], permute=1, n_resamples=N_RESAMPLES,
+            block_size=BLOCK_SIZE, seed=SEED, executor=executor
+        )
+        logger.info(f"Average Price during {label}: ${mean_ci['low']:.2f} to ${mean_ci['high']:.2f}")
+        logger.info(f"Volatility during {label}: {vol_ci['low']:.3f} to {vol_ci['high']:.3f}")
+        logger.info(
+            f"Price premium during {label}: ${premium['estimate']:.2f} "
+            f"(permutation p={premium['p_value']:.4f})"
+        )
 
 def main():
     """Main function to run weather-price analysis."""
@@ -154,10 +175,11 @@ def main():
         # Fetch combined data
         df = fetch_combined_data()
         
-        # Run analyses
-        analyze_correlations(df)
-        analyze_seasonal_patterns(df)
-        analyze_extreme_weather_impact(df)
+        # Run analyses, sharing one worker pool for the resampling
+        with ProcessPoolExecutor() as executor:
+            analyze_correlations(df, executor)
+            analyze_seasonal_patterns(df)
+            analyze_extreme_weather_impact(df, executor)
         
         logger.info("Analysis completed successfully!")
         
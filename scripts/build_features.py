@@ -0,0 +1,205 @@
+import pandas as pd
+from sqlalchemy import select, delete, insert
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+import logging
+import sys
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.models import WeatherData, FuturesData, DailyFeature
+from app.db.database import Bind, begin, connect
+from app.db.cache import record_ingestion
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Lags (in calendar days) applied to CDD/HDD
+DEGREE_DAY_LAGS = (1, 7)
+
+# Extra history loaded before a refresh window so lags and returns can be computed
+LOOKBACK_DAYS = max(DEGREE_DAY_LAGS) + 7
+
+# CME month codes for outright futures contracts
+MONTH_CODES = {code: month for month, code in enumerate('FGHJKMNQUVXZ', start=1)}
+OUTRIGHT_PATTERN = r'HH[FGHJKMNQUVXZ]\d'
+
+FEATURE_COLUMNS = [
+    'date', 'high_temp', 'low_temp', 'avg_temp', 'cdd', 'hdd', 'cdh', 'hdh',
+    'symbol', 'price', 'price_return',
+    *[f'{metric}_lag_{lag}' for lag in DEGREE_DAY_LAGS for metric in ('cdd', 'hdd')],
+    'day_of_week', 'month', 'day_of_year',
+]
+
+def select_front_month(futures_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce futures bars to one front-month close per date.
+    The front month is the outright contract with the earliest delivery month
+    trading on that date; spreads and strips are ignored.
+    """
+    df = futures_df.loc[futures_df['symbol'].str.fullmatch(OUTRIGHT_PATTERN)].copy()
+    df['date'] = pd.to_datetime(df['timestamp'], utc=True).dt.tz_localize(None).dt.normalize()
+
+    # Resolve the single-digit contract year against the trade date's decade
+    delivery_month = df['symbol'].str[2].map(MONTH_CODES)
+    year_digit = df['symbol'].str[3].astype(int)
+    delivery_year = df['date'].dt.year - df['date'].dt.year % 10 + year_digit
+    expired = delivery_year * 12 + delivery_month < df['date'].dt.year * 12 + df['date'].dt.month
+    df['delivery'] = (delivery_year + expired * 10) * 12 + delivery_month
+
+    return (
+        df.sort_values(['date', 'delivery'])
+        .drop_duplicates('date')
+        .loc[:, ['date', 'symbol', 'close']]
+        .rename(columns={'close': 'price'})
+        .reset_index(drop=True)
+    )
+
+def compute_daily_features(weather_df: pd.DataFrame, futures_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join daily weather with the front-month close and derive returns,
+    lagged degree days and calendar features. One row per weather date.
+    price_return is NaN on days the front month rolls to a new contract.
+    """
+    weather = weather_df.assign(date=pd.to_datetime(weather_df['date'])).sort_values('date')
+    front_month = select_front_month(futures_df)
+    # A roll to the next contract is not a price move, so leave its return undefined
+    same_contract = front_month['symbol'] == front_month['symbol'].shift()
+    front_month['price_return'] = front_month['price'].pct_change().where(same_contract)
+
+    df = weather.merge(front_month, on='date', how='left')
+
+    # Calendar-day lags, so gaps in the weather series yield NaN rather than shifted values
+    degree_days = weather.set_index('date')[['cdd', 'hdd']]
+    for lag in DEGREE_DAY_LAGS:
+        lagged = degree_days.set_axis(degree_days.index + pd.Timedelta(days=lag))
+        df[f'cdd_lag_{lag}'] = df['date'].map(lagged['cdd'])
+        df[f'hdd_lag_{lag}'] = df['date'].map(lagged['hdd'])
+
+    df['day_of_week'] = df['date'].dt.dayofweek
+    df['month'] = df['date'].dt.month
+    df['day_of_year'] = df['date'].dt.dayofyear
+
+    return df.loc[:, FEATURE_COLUMNS].reset_index(drop=True)
+
+def _refresh_windows(dates: Iterable[date]) -> list:
+    """
+    Group touched dates into contiguous (start, end) windows, extended forward
+    by the longest lag so downstream lags and returns are recomputed too.
+    """
+    touched = sorted({pd.Timestamp(d).date() for d in dates})
+    reach = timedelta(days=LOOKBACK_DAYS)
+
+    windows = []
+    for day in touched:
+        if windows and day <= windows[-1][1] + reach:
+            windows[-1][1] = day
+        else:
+            windows.append([day, day])
+    return [(start, end + reach) for start, end in windows]
+
+def _load_sources(start: date, end: date, bind: Optional[Bind] = None) -> tuple:
+    """Load weather and HH futures bars for [start, end]."""
+    weather_query = (
+        select(
+            WeatherData.date,
+            WeatherData.high_temp,
+            WeatherData.low_temp,
+            WeatherData.avg_temp,
+            WeatherData.cdd,
+            WeatherData.hdd,
+            WeatherData.cdh,
+            WeatherData.hdh
+        )
+        .where(WeatherData.date.between(start, end))
+        .order_by(WeatherData.date)
+    )
+    futures_query = (
+        select(FuturesData.timestamp, FuturesData.symbol, FuturesData.close)
+        .where(FuturesData.timestamp >= datetime.combine(start, datetime.min.time()))
+        .where(FuturesData.timestamp < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+        .where(FuturesData.symbol.like('HH%'))
+        .where(~FuturesData.symbol.like('%-%'))
+    )
+
+    with connect(bind) as conn:
+        result = conn.execute(weather_query)
+        weather_df = pd.DataFrame(result.fetchall(), columns=result.keys())
+        result = conn.execute(futures_query)
+        futures_df = pd.DataFrame(result.fetchall(), columns=result.keys())
+
+    return weather_df, futures_df
+
+def refresh_daily_features(dates: Iterable[date], bind: Optional[Bind] = None) -> int:
+    """
+    Recompute the daily_features rows affected by changes on the given dates.
+    Returns the number of feature rows written.
+    """
+    total_written = 0
+
+    for start, end in _refresh_windows(dates):
+        weather_df, futures_df = _load_sources(start - timedelta(days=LOOKBACK_DAYS), end, bind)
+        if weather_df.empty:
+            continue
+
+        features = compute_daily_features(weather_df, futures_df)
+        features = features.loc[features['date'].dt.date.between(start, end)]
+        features['date'] = features['date'].dt.date
+        records = features.astype(object).where(features.notna(), None).to_dict('records')
+
+        with begin(bind) as conn:
+            conn.execute(delete(DailyFeature).where(DailyFeature.date.between(start, end)))
+            if records:
+                conn.execute(insert(DailyFeature), records)
+        record_ingestion('features', pd.date_range(start, end), bind=bind)
+
+        total_written += len(records)
+        logger.info(f"Refreshed {len(records)} feature rows for {start} to {end}")
+
+    return total_written
+
+def load_daily_features(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    bind: Optional[Bind] = None
+) -> pd.DataFrame:
+    """Load the materialized feature table, optionally restricted to [start, end]."""
+    query = select(*[getattr(DailyFeature, column) for column in FEATURE_COLUMNS])
+    if start is not None:
+        query = query.where(DailyFeature.date >= start)
+    if end is not None:
+        query = query.where(DailyFeature.date <= end)
+    query = query.order_by(DailyFeature.date)
+
+    with connect(bind) as conn:
+        result = conn.execute(query)
+        return pd.DataFrame(result.fetchall(), columns=result.keys())
+
+def rebuild_daily_features(bind: Optional[Bind] = None) -> list:
+    """Rebuild the feature rows for every stored weather date and return those dates."""
+    with connect(bind) as conn:
+        dates = conn.execute(select(WeatherData.date)).scalars().all()
+
+    logger.info(f"Rebuilding features for {len(dates)} weather dates...")
+    refresh_daily_features(dates, bind=bind)
+    return dates
+
+def main():
+    """Rebuild the full daily feature table."""
+    try:
+        rebuild_daily_features()
+
+        logger.info("Feature rebuild completed successfully!")
+
+    except Exception as e:
+        logger.error(f"Error building features: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,12 @@ def clean_database():
                 connection.execute(text("TRUNCATE TABLE weather_data CASCADE"))
                 print("Deleting all settlement prices...")
                 connection.execute(text("TRUNCATE TABLE settlement_prices CASCADE"))
+                print("Deleting all daily features...")
+                connection.execute(text("TRUNCATE TABLE daily_features CASCADE"))
+                print("Deleting all weather forecasts...")
+                connection.execute(text("TRUNCATE TABLE weather_forecasts CASCADE"))
+                print("Deleting all hourly temperatures...")
+                connection.execute(text("TRUNCATE TABLE weather_hourly CASCADE"))
         print("Database cleaned successfully!")
     except Exception as e:
         print(f"Error cleaning database: {e}")
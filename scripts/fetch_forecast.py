@@ -0,0 +1,87 @@
+import requests
+import pandas as pd
+from sqlalchemy import delete, insert
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import logging
+import sys
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.models import WeatherForecast
+from app.db.database import Bind, begin
+from app.core.config import settings
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+FORECAST_DAYS = 16
+
+def fetch_weather_forecast(issue_time: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+    """
+    Fetch the current daily forecast from the Open-Meteo forecast API.
+    Every row is tagged with issue_time (defaults to now, truncated to the hour)
+    so repeated fetches are stored as separate vintages.
+    All temperatures are in Celsius.
+    """
+    issue_time = issue_time or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    params = {
+        'latitude': settings.LATITUDE,
+        'longitude': settings.LONGITUDE,
+        'daily': 'temperature_2m_max,temperature_2m_min,temperature_2m_mean',
+        'forecast_days': FORECAST_DAYS,
+        'timezone': settings.TIMEZONE,
+    }
+
+    try:
+        response = requests.get(FORECAST_URL, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        return pd.DataFrame({
+            'issue_time': issue_time,
+            'valid_date': pd.to_datetime(data['daily']['time']).date,
+            'station': settings.STATION,
+            'high_temp': data['daily']['temperature_2m_max'],
+            'low_temp': data['daily']['temperature_2m_min'],
+            'avg_temp': data['daily']['temperature_2m_mean'],
+        })
+
+    except Exception as e:
+        logger.error(f"Error fetching weather forecast: {str(e)}")
+        return None
+
+def save_forecasts(df: pd.DataFrame, bind: Optional[Bind] = None) -> int:
+    """
+    Store forecast vintages. Re-saving an (issue_time, station) vintage
+    replaces it, so reruns are idempotent. Returns the number of rows written.
+    """
+    df = df.dropna(subset=['high_temp', 'low_temp', 'avg_temp'])
+    with begin(bind) as conn:
+        for (issue_time, station), vintage in df.groupby(['issue_time', 'station']):
+            conn.execute(
+                delete(WeatherForecast)
+                .where(WeatherForecast.issue_time == issue_time)
+                .where(WeatherForecast.station == station)
+            )
+            conn.execute(insert(WeatherForecast), vintage.to_dict('records'))
+
+    logger.info(f"Saved {len(df)} forecast rows")
+    return len(df)
+
+def update_weather_forecast() -> int:
+    """Fetch and store the current forecast vintage."""
+    df = fetch_weather_forecast()
+    if df is None or df.empty:
+        return 0
+    return save_forecasts(df)
+
+if __name__ == "__main__":
+    update_weather_forecast()
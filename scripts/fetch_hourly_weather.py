@@ -0,0 +1,255 @@
+import requests
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, update, bindparam, select, text
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import logging
+import sys
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.models import HourlyTemperature, WeatherData
+from app.db.database import Bind, begin, connect, engine
+from app.db.cache import record_ingestion
+from app.core.config import settings
+from scripts.fetch_weather import REFERENCE_TEMP_C
+from scripts.build_features import refresh_daily_features
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+INSERT_CHUNK_SIZE = 10_000
+# How far back update_hourly_weather looks for days still missing degree-hours
+HOURLY_LOOKBACK_DAYS = 30
+DAILY_COLUMNS = ['cdh', 'hdh', 'hourly_low', 'hourly_high', 'hourly_mean']
+
+def default_stations() -> Dict[str, Tuple[float, float]]:
+    return {settings.STATION: (settings.LATITUDE, settings.LONGITUDE)}
+
+def fetch_hourly_weather(
+    station: str,
+    latitude: float,
+    longitude: float,
+    start_date: date,
+    end_date: date
+) -> Optional[pd.DataFrame]:
+    """
+    Fetch hourly 2m temperatures (Celsius) for one station from the Open-Meteo
+    archive API. Timestamps are requested and returned in UTC.
+    """
+    params = {
+        'latitude': latitude,
+        'longitude': longitude,
+        'start_date': start_date.strftime("%Y-%m-%d"),
+        'end_date': end_date.strftime("%Y-%m-%d"),
+        'hourly': 'temperature_2m',
+        'timezone': 'GMT',
+    }
+
+    try:
+        response = requests.get(ARCHIVE_URL, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        df = pd.DataFrame({
+            'station': station,
+            'timestamp': pd.to_datetime(data['hourly']['time'], utc=True),
+            'temperature': pd.to_numeric(pd.Series(data['hourly']['temperature_2m']), errors='coerce'),
+        })
+        return df.dropna(subset=['temperature'])
+
+    except Exception as e:
+        logger.error(f"Error fetching hourly weather for {station}: {str(e)}")
+        return None
+
+def aggregate_degree_hours(hourly_df: pd.DataFrame, timezone: Optional[str] = None) -> pd.DataFrame:
+    """
+    Compute cooling/heating degree-hours per station and local calendar day,
+    along with the daily min/max/mean of the hourly temperatures. `complete`
+    flags days whose hour count matches the local day length (23-25 across DST).
+    """
+    timezone = timezone or settings.TIMEZONE
+    temperature = hourly_df['temperature'].to_numpy(dtype=float)
+
+    df = pd.DataFrame({
+        'station': hourly_df['station'].to_numpy(),
+        'date': pd.to_datetime(hourly_df['timestamp'], utc=True).dt.tz_convert(timezone).dt.date.to_numpy(),
+        'temperature': temperature,
+        'cdh': np.maximum(temperature - REFERENCE_TEMP_C, 0),
+        'hdh': np.maximum(REFERENCE_TEMP_C - temperature, 0),
+    })
+
+    daily = (
+        df.groupby(['station', 'date'], sort=True)
+        .agg(
+            hourly_low=('temperature', 'min'),
+            hourly_high=('temperature', 'max'),
+            hourly_mean=('temperature', 'mean'),
+            hours=('temperature', 'size'),
+            cdh=('cdh', 'sum'),
+            hdh=('hdh', 'sum'),
+        )
+        .reset_index()
+    )
+
+    local_midnight = pd.DatetimeIndex(pd.to_datetime(daily['date'])).tz_localize(timezone)
+    next_midnight = pd.DatetimeIndex(pd.to_datetime(daily['date']) + pd.Timedelta(days=1)).tz_localize(timezone)
+    expected_hours = (next_midnight - local_midnight) / pd.Timedelta(hours=1)
+    daily['complete'] = daily['hours'].to_numpy() == expected_hours.to_numpy()
+    return daily
+
+def ensure_hourly_partitions(years, bind: Optional[Bind] = None) -> None:
+    """Create yearly weather_hourly partitions on PostgreSQL; no-op elsewhere."""
+    if (bind if bind is not None else engine).dialect.name != 'postgresql':
+        return
+    with begin(bind) as conn:
+        for year in sorted(set(years)):
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS weather_hourly_{year} PARTITION OF weather_hourly "
+                f"FOR VALUES FROM ('{year}-01-01 00:00+00') TO ('{year + 1}-01-01 00:00+00')"
+            ))
+
+def _load_station_hours(station: str, days: list, bind: Optional[Bind] = None) -> pd.DataFrame:
+    """Load every stored hour of station that falls on the given local days."""
+    start = pd.Timestamp(min(days)).tz_localize(settings.TIMEZONE).tz_convert('UTC')
+    end = (pd.Timestamp(max(days)) + pd.Timedelta(days=1)).tz_localize(settings.TIMEZONE).tz_convert('UTC')
+    query = (
+        select(HourlyTemperature.station, HourlyTemperature.timestamp, HourlyTemperature.temperature)
+        .where(HourlyTemperature.station == station)
+        .where(HourlyTemperature.timestamp >= start.to_pydatetime())
+        .where(HourlyTemperature.timestamp < end.to_pydatetime())
+    )
+    with connect(bind) as conn:
+        result = conn.execute(query)
+        return pd.DataFrame(result.fetchall(), columns=result.keys())
+
+def save_hourly_weather(hourly_df: pd.DataFrame, bind: Optional[Bind] = None) -> list:
+    """
+    Replace the stored hours covered by hourly_df, then recompute degree-hours
+    for the default station's touched local days from all stored hours. Only
+    days with a full set of hours are written to weather_data, so the partial
+    days at the edges of a UTC fetch never overwrite cdh/hdh. Returns the
+    dates whose weather_data row was updated.
+    """
+    if hourly_df.empty:
+        return []
+
+    timestamps = pd.to_datetime(hourly_df['timestamp'], utc=True)
+    ensure_hourly_partitions(range(timestamps.min().year, timestamps.max().year + 1), bind)
+
+    with begin(bind) as conn:
+        for station, station_df in hourly_df.groupby('station'):
+            conn.execute(
+                delete(HourlyTemperature)
+                .where(HourlyTemperature.station == station)
+                .where(HourlyTemperature.timestamp.between(
+                    station_df['timestamp'].min(), station_df['timestamp'].max()
+                ))
+            )
+        records = hourly_df[['station', 'timestamp', 'temperature']].to_dict('records')
+        for start_idx in range(0, len(records), INSERT_CHUNK_SIZE):
+            conn.execute(insert(HourlyTemperature), records[start_idx:start_idx + INSERT_CHUNK_SIZE])
+
+    station_df = hourly_df.loc[hourly_df['station'] == settings.STATION]
+    if station_df.empty:
+        return []
+
+    touched_days = list(aggregate_degree_hours(station_df)['date'])
+    daily = aggregate_degree_hours(_load_station_hours(settings.STATION, touched_days, bind))
+    daily = daily.loc[daily['complete'] & daily['date'].isin(touched_days)]
+    if daily.empty:
+        return []
+
+    with begin(bind) as conn:
+        # Days without a daily row yet are picked up once update_weather_data inserts them
+        existing = set(conn.execute(
+            select(WeatherData.date).where(WeatherData.date.in_(list(daily['date'])))
+        ).scalars())
+        daily = daily.loc[daily['date'].isin(existing)]
+        if daily.empty:
+            return []
+
+        records = daily[DAILY_COLUMNS].astype(float).rename(columns=lambda column: f'day_{column}')
+        records['day'] = daily['date']
+        conn.execute(
+            update(WeatherData)
+            .where(WeatherData.date == bindparam('day'))
+            .values({column: bindparam(f'day_{column}') for column in DAILY_COLUMNS}),
+            records.to_dict('records')
+        )
+    dates = list(daily['date'])
+    record_ingestion('weather', dates, bind=bind)
+    return dates
+
+def backfill_hourly_weather(
+    start_date: date,
+    end_date: date,
+    stations: Optional[Dict[str, Tuple[float, float]]] = None,
+    bind: Optional[Bind] = None,
+    max_workers: int = 8
+) -> int:
+    """
+    Fetch hourly temperatures for every station concurrently and store them.
+    Returns the number of hourly rows written.
+    """
+    stations = stations or default_stations()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(
+            lambda item: fetch_hourly_weather(item[0], *item[1], start_date, end_date),
+            stations.items()
+        ))
+
+    frames = [frame for frame in frames if frame is not None and not frame.empty]
+    if not frames:
+        return 0
+
+    hourly_df = pd.concat(frames, ignore_index=True)
+    updated_dates = save_hourly_weather(hourly_df, bind=bind)
+    if updated_dates:
+        refresh_daily_features(updated_dates, bind=bind)
+
+    logger.info(f"Stored {len(hourly_df):,} hourly rows for {len(frames)} station(s)")
+    return len(hourly_df)
+
+def update_hourly_weather(bind: Optional[Bind] = None) -> list:
+    """
+    Fetch hourly temperatures for the default station from the earliest
+    recent day still missing degree-hours, and fill them in along with the
+    affected daily features. Returns the dates updated.
+    """
+    today = datetime.now().date()
+    with connect(bind) as conn:
+        pending = conn.execute(
+            select(func.min(WeatherData.date))
+            .where(WeatherData.cdh.is_(None))
+            .where(WeatherData.date >= today - timedelta(days=HOURLY_LOOKBACK_DAYS))
+        ).scalar()
+    if pending is None:
+        logger.info("No recent days missing degree-hours")
+        return []
+
+    # Start a day early so the UTC fetch covers the whole first local day
+    hourly_df = fetch_hourly_weather(
+        settings.STATION, settings.LATITUDE, settings.LONGITUDE, pending - timedelta(days=1), today
+    )
+    if hourly_df is None or hourly_df.empty:
+        return []
+
+    updated_dates = save_hourly_weather(hourly_df, bind=bind)
+    if updated_dates:
+        refresh_daily_features(updated_dates, bind=bind)
+    return updated_dates
+
+if __name__ == "__main__":
+    end_date = datetime.now().date()
+    backfill_hourly_weather(end_date - timedelta(days=5*365), end_date)
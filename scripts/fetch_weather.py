@@ -1,26 +1,31 @@
 import sys
-from utils import add_project_root_to_path
-add_project_root_to_path()
+from pathlib import Path
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(str(Path(__file__).parent.parent))
 
 import requests
 from datetime import datetime, timedelta
 import pandas as pd
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
-from app.db.database import SessionLocal
+from app.db.database import get_session
+from app.db.cache import record_ingestion
 from app.db.models import WeatherData
 from app.core.config import settings
+from scripts.build_features import refresh_daily_features
 
 # Reference temperature for CDD/HDD (18.33°C ≈ 65°F)
 REFERENCE_TEMP_C = 18.33
 
-def fetch_historical_weather():
+def fetch_historical_weather(start_date=None, end_date=None):
     """
-    Fetch 5 years of historical weather data from Open-Meteo API.
-    All temperatures are in Celsius.
+    Fetch historical weather data from Open-Meteo API.
+    Defaults to the last 5 years. All temperatures are in Celsius.
     """
     # Calculate date range
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=5*365)  # 5 years
+    end_date = end_date or datetime.now()
+    start_date = start_date or end_date - timedelta(days=5*365)  # 5 years
 
     # Format dates for API
     start_str = start_date.strftime("%Y-%m-%d")
@@ -48,6 +53,11 @@ def fetch_historical_weather():
             'avg_temp': data['daily']['temperature_2m_mean']
         })
 
+        # The archive lags a few days behind; those days come back null. Drop
+        # them so they are fetched again on the next update instead of being
+        # stored with zero degree days.
+        df = df.dropna(subset=['high_temp', 'low_temp', 'avg_temp']).reset_index(drop=True)
+
         # Calculate CDD and HDD in Celsius
         df['cdd'] = df['avg_temp'].apply(lambda x: max(0, x - REFERENCE_TEMP_C))
         df['hdd'] = df['avg_temp'].apply(lambda x: max(0, REFERENCE_TEMP_C - x))
@@ -58,11 +68,13 @@ def fetch_historical_weather():
         print(f"Error fetching weather data: {e}")
         return None
 
-def save_weather_data(df):
+def save_weather_data(df, bind=None):
     """
-    Save weather data to database
+    Save weather data to database (or the given engine/connection).
+    Returns the dates that were newly inserted.
     """
-    db = SessionLocal()
+    db = get_session(bind)
+    saved_dates = []
     try:
         for _, row in df.iterrows():
             weather_data = WeatherData(
@@ -76,6 +88,7 @@ def save_weather_data(df):
             try:
                 db.add(weather_data)
                 db.commit()
+                saved_dates.append(weather_data.date)
             except IntegrityError:
                 # Skip if date already exists
                 db.rollback()
@@ -86,10 +99,40 @@ def save_weather_data(df):
         print(f"Error saving weather data: {e}")
     finally:
         db.close()
+    record_ingestion('weather', saved_dates, bind=bind)
+    return saved_dates
+
+def update_weather_data(bind=None):
+    """
+    Fetch and save weather for the days after the latest stored date,
+    then refresh the affected daily features. Returns the saved dates.
+    """
+    db = get_session(bind)
+    try:
+        latest_date = db.query(func.max(WeatherData.date)).scalar()
+    finally:
+        db.close()
+
+    end_date = datetime.now().date()
+    start_date = latest_date + timedelta(days=1) if latest_date else None
+    if start_date is not None and start_date > end_date:
+        return []
+
+    df = fetch_historical_weather(start_date=start_date, end_date=end_date)
+    if df is None or df.empty:
+        return []
+
+    saved_dates = save_weather_data(df, bind=bind)
+    if saved_dates:
+        refresh_daily_features(saved_dates, bind=bind)
+    return saved_dates
 
 if __name__ == "__main__":
     print("Fetching historical weather data...")
     df = fetch_historical_weather()
     if df is not None:
         print("Saving data to database...")
-        save_weather_data(df) 
\ No newline at end of file
+        saved_dates = save_weather_data(df)
+        if saved_dates:
+            print("Refreshing daily features...")
+            refresh_daily_features(saved_dates) 
\ No newline at end of file
@@ -2,9 +2,9 @@ import json
 import zstandard as zstd
 from datetime import datetime
 import pandas as pd
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, func
 from pathlib import Path
+from typing import Optional
 import logging
 import sys
 from dotenv import load_dotenv
@@ -13,7 +13,9 @@ from dotenv import load_dotenv
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.db.models import FuturesData
-from app.db.database import engine
+from app.db.database import Bind, connect, get_session
+from app.db.cache import record_ingestion
+from scripts.build_features import refresh_daily_features
 
 # Set up logging
 logging.basicConfig(
@@ -22,6 +24,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DATA_FILE = Path(__file__).parent.parent / "data" / "glbx-mdp3-20200125-20250124.ohlcv-1d.json.zst"
+
+# Modification time of each data file as of its last processed update
+_processed_mtimes: dict = {}
+
 def read_zst_file(file_path: Path) -> list:
     """Read and decompress a zst file containing line-delimited JSON data."""
     try:
@@ -119,17 +126,17 @@ def process_futures_data(data: list) -> pd.DataFrame:
             logger.error(df.head().to_string())
         raise
 
-def insert_futures_data(df: pd.DataFrame, batch_size: int = 1000) -> None:
-    """Insert futures data into database in batches."""
+def insert_futures_data(df: pd.DataFrame, batch_size: int = 1000, bind: Optional[Bind] = None) -> None:
+    """Insert futures data into database (or the given engine/connection) in batches."""
     try:
         logger.info("Verifying database connection...")
-        with engine.connect() as conn:
+        with connect(bind) as conn:
             logger.info("Database connection successful")
         
         total_rows = len(df)
         total_inserted = 0
         
-        with Session(engine) as session:
+        with get_session(bind) as session:
             for start_idx in range(0, total_rows, batch_size):
                 try:
                     end_idx = min(start_idx + batch_size, total_rows)
@@ -152,6 +159,7 @@ def insert_futures_data(df: pd.DataFrame, batch_size: int = 1000) -> None:
                     
                     session.add_all(futures_records)
                     session.commit()
+                    record_ingestion('futures', batch_df['timestamp'].dt.date.unique(), bind=bind)
                     
                     total_inserted += len(batch_df)
                     logger.info(f"Progress: {total_inserted}/{total_rows} records inserted")
@@ -164,7 +172,7 @@ def insert_futures_data(df: pd.DataFrame, batch_size: int = 1000) -> None:
                     raise
                 
         # Verify final count
-        with Session(engine) as session:
+        with get_session(bind) as session:
             final_count = session.query(FuturesData).count()
             logger.info(f"Total records in database: {final_count}")
             
@@ -172,25 +180,60 @@ def insert_futures_data(df: pd.DataFrame, batch_size: int = 1000) -> None:
         logger.error(f"Database error: {str(e)}")
         raise
 
+def update_futures_data(data_file: Path = DATA_FILE, bind: Optional[Bind] = None) -> list:
+    """
+    Insert only the bars newer than the latest stored timestamp and refresh
+    the affected daily features. Returns the trading dates inserted. A file
+    unchanged since its last update is not read again.
+    """
+    mtime = Path(data_file).stat().st_mtime
+    if _processed_mtimes.get(str(data_file)) == mtime:
+        logger.info(f"{data_file} unchanged since last update, skipping")
+        return []
+
+    with get_session(bind) as session:
+        latest_timestamp = session.query(func.max(FuturesData.timestamp)).scalar()
+
+    df = process_futures_data(read_zst_file(data_file))
+    if latest_timestamp is not None:
+        latest_timestamp = pd.Timestamp(latest_timestamp)
+        if latest_timestamp.tzinfo is None:
+            latest_timestamp = latest_timestamp.tz_localize('UTC')
+        df = df.loc[df['timestamp'] > latest_timestamp]
+
+    if df.empty:
+        logger.info("No new futures data to insert")
+        _processed_mtimes[str(data_file)] = mtime
+        return []
+
+    logger.info(f"Inserting {len(df)} new records into database...")
+    insert_futures_data(df, bind=bind)
+
+    dates = list(df['timestamp'].dt.date.unique())
+    refresh_daily_features(dates, bind=bind)
+    _processed_mtimes[str(data_file)] = mtime
+    return dates
+
 def main():
     """Main function to process and insert futures data."""
     try:
         # Load environment variables
         load_dotenv()
         
-        # Set up file path
-        data_file = Path(__file__).parent.parent / "data" / "glbx-mdp3-20200125-20250124.ohlcv-1d.json.zst"
-        
-        logger.info(f"Processing file: {data_file}")
+        logger.info(f"Processing file: {DATA_FILE}")
         
         # Read and process data
-        raw_data = read_zst_file(data_file)
+        raw_data = read_zst_file(DATA_FILE)
         df = process_futures_data(raw_data)
         
         # Insert data
         logger.info(f"Inserting {len(df)} records into database...")
         insert_futures_data(df)
         
+        # Refresh features for the trading dates touched by this run
+        logger.info("Refreshing daily features...")
+        refresh_daily_features(df['timestamp'].dt.date.unique())
+        
         logger.info("Processing completed successfully!")
         
     except Exception as e:
@@ -0,0 +1,147 @@
+import numpy as np
+from concurrent.futures import Executor
+from typing import Callable, Optional, Sequence
+
+# Statistics take 2D arrays (one resample per row) and return one value per row.
+# They must be module-level functions so they can be sent to worker processes.
+
+def row_mean_where(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Mean of values where mask is set, per row."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (values * mask).sum(axis=1) / mask.sum(axis=1)
+
+def row_std_where(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Sample standard deviation of values where mask is set, per row."""
+    count = mask.sum(axis=1)
+    mean = row_mean_where(values, mask)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        squared = (((values - mean[:, None]) ** 2) * mask).sum(axis=1)
+        return np.sqrt(squared / (count - 1))
+
+def row_mean_difference(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Mean of values where mask is set minus the mean where it is not, per row."""
+    return row_mean_where(values, mask) - row_mean_where(values, ~mask)
+
+def row_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson correlation of x and y, per row."""
+    x = x - x.mean(axis=1, keepdims=True)
+    y = y - y.mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (x * y).sum(axis=1) / np.sqrt((x ** 2).sum(axis=1) * (y ** 2).sum(axis=1))
+
+def block_bootstrap_indices(n: int, n_resamples: int, block_size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Moving-block bootstrap index matrix of shape (n_resamples, n). Each row
+    concatenates randomly placed runs of block_size consecutive indices, which
+    keeps the short-range autocorrelation of daily prices within each block.
+    """
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n - block_size + 1, size=(n_resamples, n_blocks))
+    return (starts[:, :, None] + np.arange(block_size)).reshape(n_resamples, -1)[:, :n]
+
+def permutation_indices(n: int, n_resamples: int, rng: np.random.Generator, block_size: int = 1) -> np.ndarray:
+    """
+    Index matrix of shape (n_resamples, n) with an independent shuffle per row.
+    With block_size > 1 whole runs of block_size consecutive indices are
+    shuffled, after a random circular shift so block edges vary between rows;
+    this keeps the autocorrelation within each block under the null.
+    """
+    block_size = max(1, min(block_size, n))
+    if block_size == 1:
+        return rng.permuted(np.tile(np.arange(n), (n_resamples, 1)), axis=1)
+
+    n_blocks = -(-n // block_size)
+    order = rng.permuted(np.tile(np.arange(n_blocks), (n_resamples, 1)), axis=1)
+    positions = (order[:, :, None] * block_size + np.arange(block_size)).reshape(n_resamples, -1)
+    # The short last block leaves the same number of out-of-range positions in every row
+    positions = positions[positions < n].reshape(n_resamples, n)
+    shifts = rng.integers(0, n, size=(n_resamples, 1))
+    return (positions + shifts) % n
+
+def _resample_chunk(args: tuple) -> np.ndarray:
+    """Evaluate statistic on one chunk of resamples (runs in a worker process)."""
+    statistic, arrays, method, permute, n_resamples, block_size, seed = args
+    rng = np.random.default_rng(seed)
+    n = len(arrays[0])
+
+    if method == 'bootstrap':
+        idx = block_bootstrap_indices(n, n_resamples, block_size, rng)
+        resampled = [array[idx] for array in arrays]
+    else:
+        idx = permutation_indices(n, n_resamples, rng, block_size)
+        resampled = [
+            array[idx] if i == permute else np.broadcast_to(array, (n_resamples, n))
+            for i, array in enumerate(arrays)
+        ]
+    return statistic(*resampled)
+
+def _run_resamples(
+    statistic: Callable,
+    arrays: Sequence[np.ndarray],
+    method: str,
+    n_resamples: int,
+    seed: int,
+    block_size: int = 1,
+    permute: int = 0,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 1000
+) -> np.ndarray:
+    """
+    Split n_resamples into chunks, each with its own child seed, so results
+    depend only on seed and chunk_size, not on how many workers ran them.
+    """
+    arrays = [np.asarray(array) for array in arrays]
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (statistic, arrays, method, permute, size, block_size, child)
+        for size, child in zip(sizes, seeds)
+    ]
+
+    if executor is None:
+        results = map(_resample_chunk, tasks)
+    else:
+        results = executor.map(_resample_chunk, tasks)
+    return np.concatenate(list(results))
+
+def bootstrap_ci(
+    statistic: Callable,
+    arrays: Sequence[np.ndarray],
+    n_resamples: int = 10_000,
+    block_size: int = 20,
+    confidence: float = 0.95,
+    seed: int = 0,
+    executor: Optional[Executor] = None
+) -> dict:
+    """Block-bootstrap percentile confidence interval for statistic(*arrays)."""
+    estimate = statistic(*[np.asarray(array)[None, :] for array in arrays])[0]
+    samples = _run_resamples(
+        statistic, arrays, 'bootstrap', n_resamples, seed,
+        block_size=block_size, executor=executor
+    )
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(samples, [alpha, 1 - alpha])
+    return {'estimate': float(estimate), 'low': float(low), 'high': float(high)}
+
+def permutation_test(
+    statistic: Callable,
+    arrays: Sequence[np.ndarray],
+    permute: int = 0,
+    n_resamples: int = 10_000,
+    block_size: int = 1,
+    seed: int = 0,
+    executor: Optional[Executor] = None
+) -> dict:
+    """
+    Two-sided permutation test of statistic(*arrays) against zero, shuffling
+    arrays[permute] and leaving the others in place. Use block_size > 1 for
+    autocorrelated series, where shuffling single days overstates significance.
+    """
+    estimate = statistic(*[np.asarray(array)[None, :] for array in arrays])[0]
+    samples = _run_resamples(
+        statistic, arrays, 'permutation', n_resamples, seed,
+        block_size=block_size, permute=permute, executor=executor
+    )
+    exceed = np.count_nonzero(np.abs(samples) >= abs(estimate))
+    return {'estimate': float(estimate), 'p_value': (exceed + 1) / (n_resamples + 1)}
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import logging
+import sys
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.models import WeatherForecast
+from app.db.database import Bind, connect
+from app.core.config import settings
+from scripts.fetch_weather import REFERENCE_TEMP_C
+from scripts.train_model import MODEL_FEATURES, load_model
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def load_forecasts(
+    issued_from: Optional[datetime] = None,
+    issued_to: Optional[datetime] = None,
+    bind: Optional[Bind] = None
+) -> pd.DataFrame:
+    """Load every stored forecast vintage, optionally limited by issue time."""
+    query = select(
+        WeatherForecast.issue_time,
+        WeatherForecast.valid_date,
+        WeatherForecast.station,
+        WeatherForecast.high_temp,
+        WeatherForecast.low_temp,
+        WeatherForecast.avg_temp
+    )
+    if issued_from is not None:
+        query = query.where(WeatherForecast.issue_time >= issued_from)
+    if issued_to is not None:
+        query = query.where(WeatherForecast.issue_time <= issued_to)
+
+    with connect(bind) as conn:
+        result = conn.execute(query)
+        return pd.DataFrame(result.fetchall(), columns=result.keys())
+
+def score_forecast_vintages(forecasts: pd.DataFrame, model) -> pd.DataFrame:
+    """
+    Predict a price for every (issue_time, valid_date, station) row in one
+    model call, and measure how each revision moved the prediction.
+
+    Adds horizon_days (valid_date minus the issue date in settings.TIMEZONE,
+    the zone valid dates are in), predicted_price and
+    price_revision (change from the previous vintage of the same valid_date
+    and station; NaN for the first vintage).
+    """
+    df = forecasts.copy()
+    df['issue_time'] = pd.to_datetime(df['issue_time'], utc=True)
+    df['valid_date'] = pd.to_datetime(df['valid_date'])
+
+    avg_temp = df['avg_temp'].to_numpy(dtype=float)
+    df['cdd'] = np.maximum(avg_temp - REFERENCE_TEMP_C, 0)
+    df['hdd'] = np.maximum(REFERENCE_TEMP_C - avg_temp, 0)
+    issue_date = df['issue_time'].dt.tz_convert(settings.TIMEZONE).dt.tz_localize(None).dt.normalize()
+    df['horizon_days'] = (df['valid_date'] - issue_date).dt.days
+
+    df['predicted_price'] = model.predict(df[MODEL_FEATURES])
+
+    df = df.sort_values(['station', 'valid_date', 'issue_time']).reset_index(drop=True)
+    df['price_revision'] = df.groupby(['station', 'valid_date'])['predicted_price'].diff()
+    return df
+
+def main():
+    """Score all stored forecast vintages with the saved price model."""
+    try:
+        forecasts = load_forecasts()
+        if forecasts.empty:
+            logger.info("No forecasts stored yet")
+            return
+
+        scored = score_forecast_vintages(forecasts, load_model())
+        logger.info(f"Scored {len(scored)} forecast rows over {scored['issue_time'].nunique()} vintages")
+
+        # Average absolute revision by horizon
+        revisions = scored.groupby('horizon_days')['price_revision'].apply(lambda s: s.abs().mean())
+        logger.info("\nMean absolute predicted price revision by horizon:")
+        for horizon, revision in revisions.dropna().items():
+            logger.info(f"{horizon:>3}d: ${revision:.3f}")
+
+    except Exception as e:
+        logger.error(f"Error scoring forecasts: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import pickle
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from pathlib import Path
+import logging
+import sys
+
+# Add the parent directory to sys.path to allow imports from app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.build_features import load_daily_features
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+MODEL_FEATURES = ['avg_temp', 'cdd', 'hdd']
+MODEL_TARGET = 'price'
+MODEL_PATH = Path(__file__).parent.parent / "models" / "price_model.pkl"
+
+def train_price_model(df: pd.DataFrame, test_size: float = 0.2) -> tuple:
+    """
+    Fit a linear regression of front-month price on weather features.
+    The most recent test_size share of days is held out for evaluation.
+    Returns (model, metrics).
+    """
+    df = df.dropna(subset=MODEL_FEATURES + [MODEL_TARGET]).sort_values('date')
+    X_train, X_test, y_train, y_test = train_test_split(
+        df[MODEL_FEATURES], df[MODEL_TARGET], test_size=test_size, shuffle=False
+    )
+
+    model = LinearRegression().fit(X_train, y_train)
+    predictions = model.predict(X_test)
+    metrics = {
+        'rmse': float(np.sqrt(mean_squared_error(y_test, predictions))),
+        'r2': float(r2_score(y_test, predictions)),
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+    }
+    return model, metrics
+
+def save_model(model, path: Path = MODEL_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(model, f)
+
+def load_model(path: Path = MODEL_PATH):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def retrain_price_model(path: Path = MODEL_PATH) -> dict:
+    """Train on the full daily feature table, save the model and return its metrics."""
+    model, metrics = train_price_model(load_daily_features())
+    save_model(model, path)
+    logger.info(f"Trained price model: RMSE={metrics['rmse']:.3f}, R²={metrics['r2']:.3f}")
+    return metrics
+
+def main():
+    """Main function to retrain the price model."""
+    try:
+        retrain_price_model()
+        logger.info("Model training completed successfully!")
+
+    except Exception as e:
+        logger.error(f"Error training model: {str(e)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,52 @@ from scripts.utils import add_project_root_to_path
 add_project_root_to_path()
 
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from app.db.models import Base
-from app.core.config import settings
 
-# Test database URL - using SQLite for testing
-TEST_DATABASE_URL = "sqlite:///./test.db"
+# Test database URL - in-memory SQLite, private to each test process/worker
+TEST_DATABASE_URL = "sqlite://"
 
 @pytest.fixture(scope="session")
 def test_engine():
-    # Override the DATABASE_URL for testing
-    settings.DATABASE_URL = TEST_DATABASE_URL
-    engine = create_engine(TEST_DATABASE_URL)
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Let SQLAlchemy own BEGIN so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     yield engine
-    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def db_connection(test_engine):
+    """
+    Connection inside a transaction that is rolled back after the test.
+    Pass it as `bind` to ETL functions; their commits become SAVEPOINTs.
+    """
+    with test_engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
 
 @pytest.fixture(scope="function")
-def test_db(test_engine):
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-    db = TestingSessionLocal()
+def test_db(db_connection):
+    db = Session(bind=db_connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
-        db.rollback()
-        db.close() 
\ No newline at end of file
+        db.close()
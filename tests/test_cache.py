@@ -0,0 +1,172 @@
+import threading
+import pytest
+from datetime import datetime, date, timedelta, timezone
+import numpy as np
+from sqlalchemy import select
+from app.db.cache import RangeCache, record_ingestion
+from app.db.models import WeatherData, FuturesData, IngestionLog
+
+START = date(2022, 3, 1)
+
+@pytest.fixture
+def cache_tables(db_connection):
+    """Seed 30 days of weather and futures inside the test transaction."""
+    db_connection.execute(WeatherData.__table__.insert(), [
+        {'date': START + timedelta(days=i), 'high_temp': 10.0 + i, 'low_temp': 0.0 + i,
+         'avg_temp': 5.0 + i, 'cdd': 0.0, 'hdd': 13.33 - i}
+        for i in range(30)
+    ])
+    db_connection.execute(FuturesData.__table__.insert(), [
+        {'timestamp': datetime.combine(START + timedelta(days=i), datetime.min.time()),
+         'instrument_id': 1, 'symbol': symbol, 'open': 2.0, 'high': 2.0, 'low': 2.0,
+         'close': 2.0 + i / 100, 'volume': 10}
+        for i in range(30) for symbol in ('HHJ2', 'HHK2')
+    ])
+    return db_connection
+
+def test_repeated_range_is_served_from_cache(cache_tables):
+    """A repeated or contained range does not hit the database"""
+    cache = RangeCache(bind=cache_tables)
+
+    first = cache.get('weather', START, START + timedelta(days=9))
+    again = cache.get('weather', START + timedelta(days=2), START + timedelta(days=5))
+
+    assert cache.loads == 1
+    assert cache.hits == 1
+    assert len(first['date']) == 10
+    assert again['avg_temp'].tolist() == [7.0, 8.0, 9.0, 10.0]
+    assert not first['avg_temp'].flags.writeable
+
+def test_overlapping_ranges_merge(cache_tables):
+    """Only the uncovered days are loaded and blocks merge into one"""
+    cache = RangeCache(bind=cache_tables)
+
+    cache.get('weather', START, START + timedelta(days=9))
+    cache.get('weather', START + timedelta(days=20), START + timedelta(days=29))
+    merged = cache.get('weather', START + timedelta(days=5), START + timedelta(days=25))
+
+    assert cache.loads == 3
+    assert len(merged['date']) == 21
+    assert np.all(np.diff(merged['date']) == np.timedelta64(1, 'D'))
+
+    cache.get('weather', START, START + timedelta(days=29))
+    assert cache.loads == 3
+    assert cache.hits == 1
+
+def test_futures_are_keyed_by_symbol(cache_tables):
+    cache = RangeCache(bind=cache_tables)
+
+    df = cache.get_frame('futures', START, START + timedelta(days=4), symbol='HHJ2')
+    assert df['symbol'].unique().tolist() == ['HHJ2']
+    assert len(df) == 5
+
+    both = cache.get('futures', START, START + timedelta(days=4))
+    assert len(both['date']) == 10
+    assert cache.loads == 2
+
+def test_invalidate_only_drops_affected_days(cache_tables):
+    cache = RangeCache(bind=cache_tables)
+    cache.get('weather', START, START + timedelta(days=29))
+
+    cache_tables.execute(
+        WeatherData.__table__.update()
+        .where(WeatherData.date == START + timedelta(days=10))
+        .values(avg_temp=-1.0)
+    )
+    cache.invalidate('weather', [START + timedelta(days=10)])
+
+    # Untouched days stay cached
+    cache.get('weather', START, START + timedelta(days=9))
+    assert cache.loads == 1
+
+    refreshed = cache.get('weather', START + timedelta(days=10), START + timedelta(days=10))
+    assert cache.loads == 2
+    assert refreshed['avg_temp'].tolist() == [-1.0]
+
+def test_lru_eviction(cache_tables):
+    cache = RangeCache(bind=cache_tables, max_rows=15)
+
+    cache.get('weather', START, START + timedelta(days=9))
+    cache.get('weather', START + timedelta(days=20), START + timedelta(days=29))
+
+    assert cache.total_rows == 10
+    cache.get('weather', START + timedelta(days=20), START + timedelta(days=29))
+    assert cache.loads == 2
+
+    cache.get('weather', START, START + timedelta(days=9))
+    assert cache.loads == 3
+
+def test_unknown_dataset():
+    with pytest.raises(ValueError):
+        RangeCache().get('prices', START, START)
+
+def test_writes_from_other_processes_invalidate(cache_tables):
+    """Another process's ingestion_log entry drops the days it rewrote"""
+    cache = RangeCache(bind=cache_tables, poll_seconds=0)
+    cache.get('weather', START, START + timedelta(days=29))
+
+    cache_tables.execute(
+        WeatherData.__table__.update()
+        .where(WeatherData.date == START + timedelta(days=10))
+        .values(avg_temp=-1.0)
+    )
+    cache_tables.execute(IngestionLog.__table__.insert().values(
+        dataset='weather', start_date=START + timedelta(days=10), end_date=START + timedelta(days=10)
+    ))
+
+    refreshed = cache.get('weather', START + timedelta(days=9), START + timedelta(days=11))
+    assert cache.loads == 2
+    assert refreshed['avg_temp'].tolist() == [14.0, -1.0, 16.0]
+
+def test_hits_are_not_blocked_by_a_load(cache_tables):
+    """The database query runs outside the lock"""
+    loading = threading.Event()
+    release = threading.Event()
+
+    class SlowCache(RangeCache):
+        def _load(self, dataset, symbol, start, end):
+            if dataset == 'futures':
+                loading.set()
+                release.wait(5)
+            return super()._load(dataset, symbol, start, end)
+
+    cache = SlowCache(bind=cache_tables)
+    cache.get('weather', START, START + timedelta(days=9))
+
+    slow = threading.Thread(target=cache.get, args=('futures', START, START + timedelta(days=9)))
+    slow.start()
+    assert loading.wait(5)
+    try:
+        hit = cache.get('weather', START, START + timedelta(days=4))
+        assert cache.hits == 1
+        assert len(hit['date']) == 5
+    finally:
+        release.set()
+        slow.join()
+    assert cache.loads == 2
+
+def test_hits_within_poll_interval_skip_the_log(cache_tables):
+    """Between polls a hit is served without touching the database"""
+    cache = RangeCache(bind=cache_tables, poll_seconds=3600)
+    cache.get('weather', START, START + timedelta(days=29))
+
+    cache_tables.execute(IngestionLog.__table__.insert().values(
+        dataset='weather', start_date=START, end_date=START + timedelta(days=29)
+    ))
+    cache.get('weather', START, START + timedelta(days=29))
+
+    assert cache.loads == 1
+    assert cache.hits == 1
+
+def test_record_ingestion_logs_runs_and_prunes(db_connection):
+    db_connection.execute(IngestionLog.__table__.insert().values(
+        dataset='weather', start_date=START, end_date=START,
+        created_at=datetime.now(timezone.utc) - timedelta(days=30)
+    ))
+
+    record_ingestion('weather', [START + timedelta(days=day) for day in (3, 1, 2, 10, 11, 20)], bind=db_connection)
+
+    runs = db_connection.execute(
+        select(IngestionLog.start_date, IngestionLog.end_date).order_by(IngestionLog.start_date)
+    ).fetchall()
+    assert [(run.start_date.day, run.end_date.day) for run in runs] == [(2, 4), (11, 12), (21, 21)]
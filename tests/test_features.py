@@ -0,0 +1,104 @@
+import pytest
+from datetime import datetime, date, timedelta
+import pandas as pd
+from app.db.models import WeatherData, FuturesData
+from scripts.build_features import (
+    select_front_month,
+    compute_daily_features,
+    refresh_daily_features,
+    load_daily_features,
+    LOOKBACK_DAYS,
+)
+
+def make_weather(start, days, avg_temps=None):
+    """Build a daily weather frame with simple degree days."""
+    dates = pd.date_range(start, periods=days, freq='D')
+    avg_temps = avg_temps if avg_temps is not None else [10.0 + i for i in range(days)]
+    df = pd.DataFrame({
+        'date': dates,
+        'high_temp': [t + 5 for t in avg_temps],
+        'low_temp': [t - 5 for t in avg_temps],
+        'avg_temp': avg_temps,
+    })
+    df['cdd'] = (df['avg_temp'] - 18.33).clip(lower=0)
+    df['hdd'] = (18.33 - df['avg_temp']).clip(lower=0)
+    df['cdh'] = df['cdd'] * 24
+    df['hdh'] = df['hdd'] * 24
+    return df
+
+def test_select_front_month():
+    """Earliest delivery outright wins; spreads are ignored"""
+    futures = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-03-05', '2024-03-05', '2024-03-05', '2029-12-03', '2029-12-03']),
+        'symbol': ['HHK4', 'HHJ4', 'HHJ4-HHK4', 'HHF0', 'HHZ9'],
+        'close': [2.1, 2.0, 0.1, 3.5, 3.4],
+    })
+
+    df = select_front_month(futures)
+
+    assert df['symbol'].tolist() == ['HHJ4', 'HHZ9']
+    assert df['price'].tolist() == [2.0, 3.4]
+
+def test_compute_daily_features():
+    """Prices, returns, lags and calendar features line up by date"""
+    weather = make_weather('2024-01-01', 10)
+    futures = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-05']),
+        'symbol': ['HHG4', 'HHG4', 'HHG4'],
+        'close': [2.0, 2.5, 2.0],
+    })
+
+    df = compute_daily_features(weather, futures)
+
+    assert len(df) == 10
+    assert df['price'].isna().sum() == 7
+    assert df.loc[df['date'] == '2024-01-03', 'price_return'].iloc[0] == pytest.approx(0.25)
+    assert df.loc[df['date'] == '2024-01-05', 'price_return'].iloc[0] == pytest.approx(-0.2)
+    assert df['hdd_lag_1'].iloc[1] == df['hdd'].iloc[0]
+    assert df['hdd_lag_7'].iloc[:7].isna().all()
+    assert df['hdd_lag_7'].iloc[7] == df['hdd'].iloc[0]
+    assert df['day_of_week'].iloc[0] == 0  # 2024-01-01 was a Monday
+    assert df['day_of_year'].iloc[9] == 10
+
+def test_price_return_skips_contract_rolls():
+    """The first day on a new front month has no return against the old contract"""
+    weather = make_weather('2024-01-29', 4)
+    futures = pd.DataFrame({
+        'timestamp': pd.to_datetime(['2024-01-29', '2024-01-30', '2024-01-31', '2024-02-01']),
+        'symbol': ['HHG4', 'HHG4', 'HHH4', 'HHH4'],
+        'close': [2.0, 2.2, 3.3, 3.0],
+    })
+
+    df = compute_daily_features(weather, futures)
+
+    assert df['symbol'].tolist() == ['HHG4', 'HHG4', 'HHH4', 'HHH4']
+    assert df['price_return'].iloc[1] == pytest.approx(0.1)
+    assert pd.isna(df['price_return'].iloc[2])
+    assert df['price_return'].iloc[3] == pytest.approx(3.0 / 3.3 - 1)
+
+def test_refresh_daily_features_incremental(db_connection):
+    """Only the window around touched dates is rewritten"""
+    weather = make_weather('2023-06-01', 30)
+    db_connection.execute(WeatherData.__table__.insert(), [
+        {**row, 'date': row['date'].date()} for row in weather.to_dict('records')
+    ])
+
+    written = refresh_daily_features(weather['date'], bind=db_connection)
+    assert written == 30
+
+    # New futures bar on one date: only that date and the following lookback are rewritten
+    db_connection.execute(FuturesData.__table__.insert(), [{
+        'timestamp': datetime(2023, 6, 10), 'instrument_id': 1, 'symbol': 'HHN3',
+        'open': 2.0, 'high': 2.0, 'low': 2.0, 'close': 2.0, 'volume': 10,
+    }])
+
+    written = refresh_daily_features([date(2023, 6, 10)], bind=db_connection)
+    assert written == 1 + LOOKBACK_DAYS
+
+    df = load_daily_features(bind=db_connection)
+    assert len(df) == 30
+    assert df.loc[df['date'] == date(2023, 6, 10), 'symbol'].iloc[0] == 'HHN3'
+    assert df.loc[df['date'] == date(2023, 6, 10), 'price'].iloc[0] == 2.0
+
+    df = load_daily_features(start=date(2023, 6, 10), end=date(2023, 6, 12), bind=db_connection)
+    assert df['date'].tolist() == [date(2023, 6, 10) + timedelta(days=i) for i in range(3)]
@@ -0,0 +1,104 @@
+import re
+import pytest
+from datetime import datetime, date, timezone
+import numpy as np
+import pandas as pd
+import responses
+from sklearn.linear_model import LinearRegression
+from scripts.fetch_forecast import fetch_weather_forecast, save_forecasts
+from scripts.score_forecasts import load_forecasts, score_forecast_vintages
+
+FORECAST_URL = re.compile(r'https://api\.open-meteo\.com/v1/forecast.*')
+
+def forecast_response(avg_temps):
+    """Open-Meteo style daily forecast payload starting 2024-07-01."""
+    return {
+        "daily": {
+            "time": [f"2024-07-{day:02d}" for day in range(1, len(avg_temps) + 1)],
+            "temperature_2m_max": [t + 5 for t in avg_temps],
+            "temperature_2m_min": [t - 5 for t in avg_temps],
+            "temperature_2m_mean": avg_temps
+        }
+    }
+
+@pytest.fixture
+def forecast_api():
+    """Local stand-in for the Open-Meteo forecast endpoint"""
+    with responses.RequestsMock() as rsps:
+        yield rsps
+
+@pytest.fixture
+def price_model():
+    """Price rises 0.1 per degree day of either kind."""
+    X = pd.DataFrame({'avg_temp': [0.0, 10.0, 20.0, 30.0], 'cdd': [0.0, 0.0, 1.67, 11.67], 'hdd': [18.33, 8.33, 0.0, 0.0]})
+    return LinearRegression().fit(X, 2.0 + 0.1 * (X['cdd'] + X['hdd']))
+
+def test_fetch_weather_forecast(forecast_api):
+    forecast_api.add(responses.GET, FORECAST_URL, json=forecast_response([20.0, 25.0, 30.0]))
+    issue_time = datetime(2024, 7, 1, 6, tzinfo=timezone.utc)
+
+    df = fetch_weather_forecast(issue_time)
+
+    assert len(df) == 3
+    assert (df['issue_time'] == issue_time).all()
+    assert df['valid_date'].tolist() == [date(2024, 7, 1), date(2024, 7, 2), date(2024, 7, 3)]
+    assert df['avg_temp'].tolist() == [20.0, 25.0, 30.0]
+
+def test_fetch_weather_forecast_api_error(forecast_api):
+    forecast_api.add(responses.GET, FORECAST_URL, status=500)
+
+    assert fetch_weather_forecast() is None
+
+def test_vintages_are_stored_and_scored(forecast_api, db_connection, price_model):
+    """Two vintages of the same days are kept apart and scored in one pass"""
+    forecast_api.add(responses.GET, FORECAST_URL, json=forecast_response([20.0, 25.0, 30.0]))
+    forecast_api.add(responses.GET, FORECAST_URL, json=forecast_response([22.0, 25.0, 28.0]))
+
+    first = datetime(2024, 7, 1, 6, tzinfo=timezone.utc)
+    second = datetime(2024, 7, 1, 12, tzinfo=timezone.utc)
+    save_forecasts(fetch_weather_forecast(first), bind=db_connection)
+    save_forecasts(fetch_weather_forecast(second), bind=db_connection)
+
+    forecasts = load_forecasts(bind=db_connection)
+    assert len(forecasts) == 6
+
+    scored = score_forecast_vintages(forecasts, price_model)
+
+    assert scored['horizon_days'].tolist() == [0, 0, 1, 1, 2, 2]
+    np.testing.assert_allclose(
+        scored['predicted_price'],
+        2.0 + 0.1 * np.abs(scored['avg_temp'] - 18.33),
+        atol=1e-6
+    )
+    np.testing.assert_allclose(scored['price_revision'].iloc[[1, 3, 5]], [0.2, 0.0, -0.2], atol=1e-5)
+    assert scored['price_revision'].iloc[[0, 2, 4]].isna().all()
+
+def test_save_forecasts_is_idempotent(db_connection):
+    df = pd.DataFrame({
+        'issue_time': datetime(2024, 7, 1, tzinfo=timezone.utc),
+        'valid_date': [date(2024, 7, 1), date(2024, 7, 2)],
+        'station': 'KNYC',
+        'high_temp': [25.0, 26.0],
+        'low_temp': [15.0, 16.0],
+        'avg_temp': [20.0, 21.0],
+    })
+
+    save_forecasts(df, bind=db_connection)
+    save_forecasts(df, bind=db_connection)
+
+    assert len(load_forecasts(bind=db_connection)) == 2
+
+def test_horizon_uses_local_issue_date(price_model):
+    """A late-evening local issue is still the same day even though it is past midnight UTC"""
+    forecasts = pd.DataFrame({
+        'issue_time': [datetime(2024, 7, 2, 3, tzinfo=timezone.utc)] * 2,  # 23:00 on 2024-07-01 in New York
+        'valid_date': [date(2024, 7, 1), date(2024, 7, 2)],
+        'station': 'KNYC',
+        'high_temp': [25.0, 26.0],
+        'low_temp': [15.0, 16.0],
+        'avg_temp': [20.0, 21.0],
+    })
+
+    scored = score_forecast_vintages(forecasts, price_model)
+
+    assert scored['horizon_days'].tolist() == [0, 1]
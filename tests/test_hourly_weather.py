@@ -0,0 +1,163 @@
+import re
+import pytest
+from datetime import date, datetime, timedelta
+import pandas as pd
+import responses
+from sqlalchemy import select
+from app.db.models import HourlyTemperature, WeatherData
+from scripts.fetch_hourly_weather import (
+    fetch_hourly_weather,
+    aggregate_degree_hours,
+    save_hourly_weather,
+    backfill_hourly_weather,
+    update_hourly_weather,
+)
+
+ARCHIVE_URL = re.compile(r'https://archive-api\.open-meteo\.com/v1/archive.*')
+
+def hourly_response(start, temperatures):
+    """Open-Meteo style hourly payload in UTC."""
+    times = pd.date_range(start, periods=len(temperatures), freq='h')
+    return {
+        "hourly": {
+            "time": times.strftime("%Y-%m-%dT%H:%M").tolist(),
+            "temperature_2m": temperatures
+        }
+    }
+
+def test_aggregate_degree_hours_uses_local_days():
+    """A day that swings around the reference temperature accrues both CDH and HDH"""
+    # 2024-07-01 local (America/New_York, UTC-4) runs 04:00 UTC to 04:00 UTC
+    temperatures = [8.33] * 12 + [28.33] * 12
+    hourly = pd.DataFrame({
+        'station': 'KNYC',
+        'timestamp': pd.date_range('2024-07-01 04:00', periods=24, freq='h', tz='UTC'),
+        'temperature': temperatures,
+    })
+
+    daily = aggregate_degree_hours(hourly, timezone='America/New_York')
+
+    assert len(daily) == 1
+    row = daily.iloc[0]
+    assert row['date'] == date(2024, 7, 1)
+    assert row['hours'] == 24
+    assert row['cdh'] == pytest.approx(120.0)
+    assert row['hdh'] == pytest.approx(120.0)
+    assert row['hourly_mean'] == pytest.approx(18.33)
+
+@responses.activate
+def test_fetch_hourly_weather():
+    responses.add(responses.GET, ARCHIVE_URL, json=hourly_response('2024-07-01', [20.0, None, 22.0]))
+
+    df = fetch_hourly_weather('KNYC', 40.7, -74.0, date(2024, 7, 1), date(2024, 7, 1))
+
+    assert len(df) == 2
+    assert str(df['timestamp'].dt.tz) == 'UTC'
+
+@responses.activate
+def test_fetch_hourly_weather_api_error():
+    responses.add(responses.GET, ARCHIVE_URL, status=500)
+
+    assert fetch_hourly_weather('KNYC', 40.7, -74.0, date(2024, 7, 1), date(2024, 7, 1)) is None
+
+def test_save_hourly_weather_sets_degree_hours(db_connection):
+    db_connection.execute(WeatherData.__table__.insert(), [{
+        'date': date(2024, 7, 1), 'high_temp': 30.0, 'low_temp': 20.0,
+        'avg_temp': 25.0, 'cdd': 6.67, 'hdd': 0.0,
+    }])
+    hourly = pd.DataFrame({
+        'station': ['KNYC'] * 24 + ['KBOS'] * 24,
+        'timestamp': list(pd.date_range('2024-07-01 04:00', periods=24, freq='h', tz='UTC')) * 2,
+        'temperature': [20.33] * 48,
+    })
+
+    updated = save_hourly_weather(hourly, bind=db_connection)
+    # Saving the same hours again replaces them
+    save_hourly_weather(hourly, bind=db_connection)
+
+    assert updated == [date(2024, 7, 1)]
+    assert len(db_connection.execute(select(HourlyTemperature)).fetchall()) == 48
+    weather = db_connection.execute(select(
+        WeatherData.cdh, WeatherData.hdh, WeatherData.hourly_low, WeatherData.hourly_high, WeatherData.hourly_mean
+    )).one()
+    assert weather.cdh == pytest.approx(48.0)
+    assert weather.hdh == 0.0
+    assert weather.hourly_mean == pytest.approx(20.33)
+    assert weather.hourly_low == weather.hourly_high == pytest.approx(20.33)
+
+def test_save_hourly_weather_skips_days_without_daily_row(db_connection):
+    hourly = pd.DataFrame({
+        'station': 'KNYC',
+        'timestamp': pd.date_range('2024-07-01 04:00', periods=24, freq='h', tz='UTC'),
+        'temperature': 20.33,
+    })
+
+    assert save_hourly_weather(hourly, bind=db_connection) == []
+
+@responses.activate
+def test_backfill_hourly_weather_multiple_stations(db_connection):
+    responses.add(responses.GET, ARCHIVE_URL, json=hourly_response('2024-07-01', [25.0] * 48))
+
+    stations = {f'ST{i}': (40.0 + i, -74.0) for i in range(4)}
+    written = backfill_hourly_weather(date(2024, 7, 1), date(2024, 7, 2), stations=stations, bind=db_connection)
+
+    assert written == 4 * 48
+    assert len(responses.calls) == 4
+
+def test_partial_edge_days_are_not_written(db_connection):
+    """A UTC fetch only covers part of its first and last local day"""
+    db_connection.execute(WeatherData.__table__.insert(), [
+        {'date': date(2024, 6, 30) + pd.Timedelta(days=i), 'high_temp': 30.0, 'low_temp': 20.0,
+         'avg_temp': 25.0, 'cdd': 6.67, 'hdd': 0.0}
+        for i in range(4)
+    ])
+    first_fetch = pd.DataFrame({
+        'station': 'KNYC',
+        'timestamp': pd.date_range('2024-07-01 00:00', periods=48, freq='h', tz='UTC'),
+        'temperature': 20.33,
+    })
+
+    # 2024-06-30 gets 4 hours and 2024-07-02 gets 20; only 2024-07-01 is complete
+    assert save_hourly_weather(first_fetch, bind=db_connection) == [date(2024, 7, 1)]
+
+    # The next fetch completes 2024-07-02 together with the hours already stored
+    next_fetch = first_fetch.assign(timestamp=first_fetch['timestamp'] + pd.Timedelta(days=2))
+    assert save_hourly_weather(next_fetch, bind=db_connection) == [date(2024, 7, 2), date(2024, 7, 3)]
+
+    weather = db_connection.execute(
+        select(WeatherData.date, WeatherData.cdh).order_by(WeatherData.date)
+    ).fetchall()
+    assert weather[0].cdh is None
+    assert [row.cdh for row in weather[1:]] == [pytest.approx(48.0)] * 3
+
+def test_aggregate_flags_dst_days_complete():
+    """The 23-hour spring-forward day counts as complete"""
+    hourly = pd.DataFrame({
+        'station': 'KNYC',
+        'timestamp': pd.date_range('2024-03-10 05:00', periods=23, freq='h', tz='UTC'),
+        'temperature': 5.0,
+    })
+
+    daily = aggregate_degree_hours(hourly, timezone='America/New_York')
+
+    assert daily['date'].tolist() == [date(2024, 3, 10)]
+    assert daily['complete'].all()
+
+@responses.activate
+def test_update_hourly_weather_fills_missing_days(db_connection):
+    """Daily rows inserted without degree-hours get them on the next hourly run"""
+    today = datetime.now().date()
+    days = [today - timedelta(days=3), today - timedelta(days=2)]
+    db_connection.execute(WeatherData.__table__.insert(), [
+        {'date': day, 'high_temp': 30.0, 'low_temp': 20.0, 'avg_temp': 25.0, 'cdd': 6.67, 'hdd': 0.0}
+        for day in days
+    ])
+    # Every hour from the day before the first missing day through the end of today
+    responses.add(responses.GET, ARCHIVE_URL, json=hourly_response(str(today - timedelta(days=4)), [20.33] * 5 * 24))
+
+    updated = update_hourly_weather(bind=db_connection)
+
+    assert updated == days
+    cdh = db_connection.execute(select(WeatherData.cdh).order_by(WeatherData.date)).scalars().all()
+    assert cdh == [pytest.approx(48.0)] * 2
+    assert update_hourly_weather(bind=db_connection) == []
@@ -0,0 +1,37 @@
+import json
+import pytest
+import zstandard as zstd
+from sqlalchemy import select, func
+from app.db.models import FuturesData
+from scripts import process_data
+from scripts.process_data import update_futures_data
+
+def bar(ts_event, close):
+    """One Databento-style OHLCV record."""
+    return {
+        'hd': {'ts_event': ts_event, 'instrument_id': 1},
+        'symbol': 'HHN4',
+        'open': close, 'high': close, 'low': close, 'close': close, 'volume': 10,
+    }
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    """A small .zst file plus a clean record of processed files"""
+    monkeypatch.setattr(process_data, '_processed_mtimes', {})
+    path = tmp_path / "bars.json.zst"
+    lines = "\n".join(json.dumps(bar(f"2024-07-0{day}T00:00:00Z", 2.0 + day / 10)) for day in (1, 2))
+    path.write_bytes(zstd.ZstdCompressor().compress(lines.encode('utf-8')))
+    return path
+
+def test_unchanged_file_is_not_read_again(data_file, db_connection, monkeypatch):
+    reads = []
+    read_zst_file = process_data.read_zst_file
+    monkeypatch.setattr(process_data, 'read_zst_file', lambda path: reads.append(path) or read_zst_file(path))
+
+    first = update_futures_data(data_file, bind=db_connection)
+    second = update_futures_data(data_file, bind=db_connection)
+
+    assert len(first) == 2
+    assert second == []
+    assert len(reads) == 1
+    assert db_connection.execute(select(func.count()).select_from(FuturesData)).scalar() == 2
@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scripts.resampling import (
+    block_bootstrap_indices,
+    permutation_indices,
+    bootstrap_ci,
+    permutation_test,
+    row_corr,
+    row_mean_where,
+    row_std_where,
+)
+
+def test_block_bootstrap_indices():
+    idx = block_bootstrap_indices(100, 50, 10, np.random.default_rng(0))
+
+    assert idx.shape == (50, 100)
+    assert idx.min() >= 0 and idx.max() < 100
+    # Every block is a run of consecutive indices
+    blocks = idx.reshape(50, 10, 10)
+    assert (np.diff(blocks, axis=2) == 1).all()
+
+def test_permutation_indices():
+    idx = permutation_indices(20, 5, np.random.default_rng(0))
+
+    assert (np.sort(idx, axis=1) == np.arange(20)).all()
+
+def test_block_permutation_indices_keep_runs():
+    """Blocks of consecutive days move together, wrapping around the end"""
+    idx = permutation_indices(23, 50, np.random.default_rng(0), block_size=5)
+
+    assert (np.sort(idx, axis=1) == np.arange(23)).all()
+    steps = np.diff(idx, axis=1) % 23
+    # 5 blocks (the last one short) leave at most 4 breaks; the circular shift wraps without one
+    assert ((steps != 1).sum(axis=1) <= 4).all()
+
+def test_row_statistics_match_numpy():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=(3, 50))
+    other = rng.normal(size=(3, 50))
+    mask = rng.random((3, 50)) > 0.5
+
+    np.testing.assert_allclose(row_mean_where(values, mask), [v[m].mean() for v, m in zip(values, mask)])
+    np.testing.assert_allclose(row_std_where(values, mask), [v[m].std(ddof=1) for v, m in zip(values, mask)])
+    np.testing.assert_allclose(row_corr(values, other), [np.corrcoef(v, o)[0, 1] for v, o in zip(values, other)])
+
+def test_bootstrap_ci_is_reproducible_across_workers():
+    rng = np.random.default_rng(2)
+    values = rng.normal(5.0, 1.0, size=500)
+    mask = np.ones(500, dtype=bool)
+
+    serial = bootstrap_ci(row_mean_where, [values, mask], n_resamples=2000, seed=7)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = bootstrap_ci(row_mean_where, [values, mask], n_resamples=2000, seed=7, executor=executor)
+
+    assert serial == parallel
+    assert serial['low'] < 5.0 < serial['high']
+    assert serial['low'] < serial['estimate'] < serial['high']
+
+def test_permutation_test_detects_correlation():
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=300)
+
+    related = permutation_test(row_corr, [x, x + rng.normal(size=300)], permute=1, n_resamples=1000, seed=0)
+    unrelated = permutation_test(row_corr, [x, rng.normal(size=300)], permute=1, n_resamples=1000, seed=0)
+
+    assert related['p_value'] < 0.01
+    assert unrelated['p_value'] > 0.05
+
+def test_block_permutation_is_less_significant_for_autocorrelated_series():
+    """Two unrelated random walks look correlated to an iid shuffle but not to a block one"""
+    rng = np.random.default_rng(4)
+    x = np.cumsum(rng.normal(size=400))
+    y = np.cumsum(rng.normal(size=400))
+
+    iid = permutation_test(row_corr, [x, y], permute=1, n_resamples=1000, seed=0)
+    blocked = permutation_test(row_corr, [x, y], permute=1, n_resamples=1000, block_size=50, seed=0)
+
+    assert blocked['p_value'] > iid['p_value']
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import threading
+import pytest
+from fastapi.testclient import TestClient
+from app.core.scheduler import Scheduler, Job
+
+def process_id():
+    return os.getpid()
+
+def failing_job():
+    raise RuntimeError("upstream unavailable")
+
+@pytest.mark.asyncio
+async def test_run_job_records_status():
+    scheduler = Scheduler()
+    results = []
+    scheduler.add_job(Job('echo', lambda: 42, 60, on_result=results.append))
+
+    assert await scheduler.run_job('echo')
+
+    status = scheduler.status()[0]
+    assert results == [42]
+    assert status['runs'] == 1
+    assert status['last_status'] == 'success'
+    assert status['last_duration_seconds'] >= 0
+    assert status['running'] == 0
+
+@pytest.mark.asyncio
+async def test_failed_job_is_reported():
+    scheduler = Scheduler()
+    scheduler.add_job(Job('broken', failing_job, 60))
+
+    await scheduler.run_job('broken')
+
+    status = scheduler.status()[0]
+    assert status['failures'] == 1
+    assert status['last_status'] == 'error'
+    assert status['last_error'] == "upstream unavailable"
+
+@pytest.mark.asyncio
+async def test_overlapping_runs_are_skipped():
+    scheduler = Scheduler()
+    release = threading.Event()
+    scheduler.add_job(Job('slow', lambda: release.wait(5), 60))
+
+    first = asyncio.ensure_future(scheduler.run_job('slow'))
+    await asyncio.sleep(0.05)
+    assert not await scheduler.run_job('slow')
+
+    release.set()
+    assert await first
+    assert scheduler.jobs['slow'].skipped == 1
+    assert scheduler.jobs['slow'].runs == 1
+
+@pytest.mark.asyncio
+async def test_cpu_bound_job_runs_in_worker_process():
+    scheduler = Scheduler(max_workers=1)
+    pids = []
+    scheduler.add_job(Job('cpu', process_id, 60, cpu_bound=True, on_result=pids.append))
+
+    await scheduler.run_job('cpu')
+    await scheduler.stop()
+
+    assert pids and pids[0] != os.getpid()
+
+@pytest.mark.asyncio
+async def test_timer_runs_jobs_on_interval():
+    scheduler = Scheduler()
+    scheduler.add_job(Job('tick', lambda: None, 0.01))
+
+    scheduler.start()
+    await asyncio.sleep(0.1)
+    await scheduler.stop()
+
+    assert scheduler.jobs['tick'].runs >= 2
+
+def test_jobs_endpoint():
+    from app.main import app
+
+    response = TestClient(app).get("/jobs")
+
+    assert response.status_code == 200
+    assert {job['name'] for job in response.json()} == {'weather', 'hourly', 'futures', 'forecast', 'features', 'model'}
+
+@pytest.mark.asyncio
+async def test_exclusion_group_serializes_jobs():
+    scheduler = Scheduler()
+    active = []
+    overlaps = []
+
+    def writer():
+        active.append(1)
+        overlaps.append(len(active))
+        threading.Event().wait(0.05)
+        active.pop()
+
+    scheduler.add_job(Job('first', writer, 60, exclusion_group='features'))
+    scheduler.add_job(Job('second', writer, 60, exclusion_group='features'))
+
+    await asyncio.gather(scheduler.run_job('first'), scheduler.run_job('second'))
+
+    assert overlaps == [1, 1]
+    assert scheduler.jobs['second'].runs == 1
+
+@pytest.mark.asyncio
+async def test_run_on_start_does_not_wait_an_interval():
+    scheduler = Scheduler()
+    scheduler.add_job(Job('eager', lambda: None, 3600, run_on_start=True))
+    scheduler.add_job(Job('lazy', lambda: None, 3600))
+
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop()
+
+    assert scheduler.jobs['eager'].runs == 1
+    assert scheduler.jobs['lazy'].runs == 0
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_fired_ticks():
+    """A tick fired right before stop() is awaited and does not start a run"""
+    scheduler = Scheduler(max_workers=1)
+    scheduler.add_job(Job('cpu', process_id, 3600, cpu_bound=True, run_on_start=True))
+
+    scheduler.start()
+    await scheduler.stop()
+
+    assert not scheduler._ticks
+    assert scheduler.jobs['cpu'].runs == 0
+    assert scheduler._pool is None
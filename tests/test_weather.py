@@ -1,9 +1,13 @@
+import re
 import pytest
 from datetime import datetime, date
 import pandas as pd
 import responses  # for mocking HTTP requests
 from scripts.fetch_weather import fetch_historical_weather, save_weather_data
 from app.core.config import settings
+from app.db.models import WeatherData
+
+ARCHIVE_URL = re.compile(r'https://archive-api\.open-meteo\.com/.*')
 
 # Sample API response data
 MOCK_WEATHER_RESPONSE = {
@@ -22,7 +26,7 @@ def mock_weather_api():
         # Mock any URL that starts with the Open-Meteo API base
         rsps.add(
             responses.GET,
-            url=responses.matchers.URLMatcher('https://archive-api.open-meteo.com'),
+            url=ARCHIVE_URL,
             json=MOCK_WEATHER_RESPONSE,
             status=200
         )
@@ -37,14 +41,14 @@ def test_fetch_weather_success(mock_weather_api):
     assert len(df) == 2  # Our mock data has 2 days
     
     # Check calculated fields
-    assert df['cdd'].iloc[0] == 5.0  # 70.0 - 65 = 5
+    assert df['cdd'].iloc[0] == pytest.approx(51.67)  # 70.0 - 18.33 (Celsius reference)
     assert df['hdd'].iloc[0] == 0.0  # No HDD when temp > 65
     
     # Check data types
     assert isinstance(df['date'].iloc[0], pd.Timestamp)
     assert isinstance(df['high_temp'].iloc[0], float)
 
-def test_save_weather_data(test_db):
+def test_save_weather_data(test_db, db_connection):
     """Test saving weather data to database"""
     # Create test DataFrame
     test_data = pd.DataFrame({
@@ -57,7 +61,7 @@ def test_save_weather_data(test_db):
     })
     
     # Save data
-    save_weather_data(test_data)
+    save_weather_data(test_data, bind=db_connection)
     
     # Query the database to verify
     result = test_db.query(WeatherData).all()
@@ -70,7 +74,7 @@ def test_save_weather_data(test_db):
     assert first_record.cdd == 5.0
     assert first_record.hdd == 0.0
 
-def test_save_duplicate_dates(test_db):
+def test_save_duplicate_dates(test_db, db_connection):
     """Test handling of duplicate dates when saving"""
     # Create test DataFrame with duplicate dates
     test_data = pd.DataFrame({
@@ -83,7 +87,7 @@ def test_save_duplicate_dates(test_db):
     })
     
     # Save data
-    save_weather_data(test_data)
+    save_weather_data(test_data, bind=db_connection)
     
     # Verify only one record was saved
     result = test_db.query(WeatherData).all()
@@ -95,9 +99,32 @@ def test_fetch_weather_api_error():
     # Mock API error response
     responses.add(
         responses.GET,
-        url=responses.matchers.URLMatcher('https://archive-api.open-meteo.com'),
+        url=ARCHIVE_URL,
         status=500
     )
     
     df = fetch_historical_weather()
-    assert df is None 
\ No newline at end of file
+    assert df is None
+
+
+@responses.activate
+def test_fetch_weather_drops_lagging_days():
+    """Days the archive has not filled in yet are left for the next update"""
+    responses.add(
+        responses.GET,
+        url=ARCHIVE_URL,
+        json={
+            "daily": {
+                "time": ["2024-01-01", "2024-01-02", "2024-01-03"],
+                "temperature_2m_max": [25.0, None, None],
+                "temperature_2m_min": [15.0, None, None],
+                "temperature_2m_mean": [20.0, None, None]
+            }
+        },
+        status=200
+    )
+
+    df = fetch_historical_weather()
+
+    assert df['date'].tolist() == [pd.Timestamp("2024-01-01")]
+    assert df['cdd'].iloc[0] == pytest.approx(1.67)